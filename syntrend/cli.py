@@ -2,8 +2,8 @@ import click
 import pathlib
 
 from syntrend import generators, formatters
-from syntrend.utils import manager
-from syntrend.config import load_config
+from syntrend.utils import manager, sharding
+from syntrend.config import CONFIG, load_config
 
 ERRORS = []
 
@@ -21,11 +21,30 @@ def app():
 
 @app.command()
 @click.argument('project_file', nargs=1, type=click.Path(exists=True))
-def generate(project_file: pathlib.Path):
+@click.option(
+    '--workers',
+    default=1,
+    type=click.IntRange(min=1),
+    help='Number of processes to split the generation of each object across',
+)
+@click.option(
+    '--speed',
+    type=click.FloatRange(min=0),
+    help='Playback speed of time-ordered events (1 for real-time, 0 for no delays)',
+)
+def generate(project_file: pathlib.Path, workers: int, speed: float):
     """
     Uses the available project file to generate datasets
     """
+    config_overrides = {}
+    if speed is not None:
+        config_overrides['playback_speed'] = speed
+    if workers > 1:
+        sharding.run(project_file, workers, config_overrides)
+        return
     load_config(project_file)
+    for config_key, config_value in config_overrides.items():
+        setattr(CONFIG.config, config_key, config_value)
     generators.load_generators()
     formatters.load_formatters()
     manager.ROOT_MANAGER.load()
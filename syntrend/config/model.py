@@ -8,6 +8,9 @@ from os import getenv
 from pathlib import Path
 from functools import partial
 
+from syntrend.utils.engine import ENGINES
+from syntrend.utils.expressions import BACKENDS
+
 LOG = logging.getLogger(__name__)
 DEFAULT_ENV_VAR_PREFIX = 'SYNTREND_'
 OUTPUT_STDOUT = Path('-')
@@ -176,19 +179,87 @@ class ModuleConfig(Validated):
         default=int(getenv(f'{DEFAULT_ENV_VAR_PREFIX}_MAX_HISTORIAN_BUFFER', 20))
     )
     """Maximum values to be kept in a buffer of previous values"""
+    historian_window: int = dc.field(
+        default=int(getenv(f'{DEFAULT_ENV_VAR_PREFIX}_HISTORIAN_WINDOW', 1000))
+    )
+    """Number of previous values aggregated for each numeric field of an object"""
     generator_dir: str = dc.field(
         default=getenv(f'{DEFAULT_ENV_VAR_PREFIX}_GENERATOR_DIR', '')
     )
     """Source Directory of Custom Generators"""
+    batch_size: int = dc.field(
+        default=int(getenv(f'{DEFAULT_ENV_VAR_PREFIX}_BATCH_SIZE', 1000))
+    )
+    """Number of values rendered per chunk for objects without expressions"""
+    engine: str = dc.field(default=getenv(f'{DEFAULT_ENV_VAR_PREFIX}_ENGINE', 'python'))
+    """Engine drawing numeric values in bulk (`python` or `numpy`)"""
+    seed: str = dc.field(default=getenv(f'{DEFAULT_ENV_VAR_PREFIX}_SEED', ''))
+    """Seed of all random streams. Runs are not reproducible when left empty"""
+    playback_speed: float = dc.field(
+        default=float(getenv(f'{DEFAULT_ENV_VAR_PREFIX}_PLAYBACK_SPEED', 1.0))
+    )
+    """Speed at which time-ordered events are replayed (`0` for no delays)"""
+    expression_cache_size: int = dc.field(
+        default=int(getenv(f'{DEFAULT_ENV_VAR_PREFIX}_EXPRESSION_CACHE_SIZE', 400))
+    )
+    """Number of compiled expressions kept in memory"""
+    expression_cache_dir: str = dc.field(
+        default=getenv(f'{DEFAULT_ENV_VAR_PREFIX}_EXPRESSION_CACHE_DIR', '')
+    )
+    """Directory caching compiled expressions between runs"""
+    expression_backend: str = dc.field(
+        default=getenv(f'{DEFAULT_ENV_VAR_PREFIX}_EXPRESSION_BACKEND', 'jinja')
+    )
+    """Backend compiling expressions (`jinja` or `native`)"""
 
     parse_max_generator_retries = parse_int(_min=1)
     """Parse `max_generator_retries` and validates if value >= 1"""
     parse_max_historian_buffer = parse_int(_min=1)
     """Parse `max_historian_buffer` and validates if value >= 1"""
+    parse_historian_window = parse_int(_min=1)
+    """Parse `historian_window` and validates if value >= 1"""
+    parse_batch_size = parse_int(_min=1)
+    """Parse `batch_size` and validates if value >= 1"""
+    parse_expression_cache_size = parse_int(_min=0)
+    """Parse `expression_cache_size` and validates if value >= 0"""
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+    def parse_playback_speed(self, value) -> float:
+        """Parse `playback_speed` and validates if value >= 0"""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise TypeError('Value must be parsable to float') from None
+        if value < 0:
+            raise ValueError('Value must be >= 0')
+        return value
+
+    def parse_seed(self, value) -> str:
+        """Parse `seed` to a string to also support integer seeds"""
+        return '' if value is None else str(value)
+
+    def parse_engine(self, value: str) -> str:
+        """Parse `engine` and validates it is a supported engine"""
+        if value not in ENGINES:
+            raise ValueError(f'Value must be one of {", ".join(ENGINES)}')
+        return value
+
+    def parse_expression_backend(self, value: str) -> str:
+        """Parse `expression_backend` and validates it is a supported backend"""
+        if value not in BACKENDS:
+            raise ValueError(f'Value must be one of {", ".join(BACKENDS)}')
+        return value
+
+    def parse_expression_cache_dir(self, value: str) -> Path | str:
+        """Parse `expression_cache_dir` and creates the directory if missing"""
+        if not value:
+            return ''
+        parsed_path = Path(value).absolute()
+        parsed_path.mkdir(parents=True, exist_ok=True)
+        return parsed_path
+
     def parse_generator_dir(self, value: str) -> Path:
         """Parse `generator_dir` and validates path exists and is a directory"""
         if not value:
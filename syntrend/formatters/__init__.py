@@ -3,23 +3,31 @@ from syntrend.utils import writers
 
 from pathlib import Path
 from tempfile import mkstemp
-from typing import Callable, Union
+from typing import Callable, Iterator, Union
 from os import close, linesep
 from importlib import import_module
 import pickle
 import logging
+import queue
 import sys
+import threading
 from collections import namedtuple
 
 LOG = logging.getLogger(__name__)
 T_Primary = Union[str, int, float, dict[str, 'T_Primary']]
 Formatter = namedtuple('Formatter', 'format,close')
+StreamFormatter = namedtuple('StreamFormatter', 'header,rows,footer')
 T_Formatter = Callable[[str], Callable[['Collection'], list[str]]]
+T_StreamFormatter = Callable[[str], StreamFormatter]
 FORMATTERS: dict[str, T_Formatter] = {}
+STREAM_FORMATTERS: dict[str, T_StreamFormatter] = {}
 
 STREAM_FEED_EVENT = 'stream_event'
 STREAM_FEED_COLLECTION = 'stream_collection'
 TH_TEMP_PATH = 'temp_path'
+TH_SPOOL = 'spool'
+TH_COUNT = 'count'
+QUEUE_CLOSE = object()
 
 FORMAT_FIELDS_DEFAULT = {
     'nl': linesep,
@@ -41,30 +49,38 @@ class Collection(list):
 
 
 class TempHandler(writers.OutputHandler):
+    """Spools events to an append-only temp file of pickle frames.
+
+    Each event is pickled once when written and read back lazily by
+    `get_collection`, keeping collection generation linear in the record count.
+    Collections of formats without a stream formatter (ie. `table`) are spooled
+    to be formatted as a whole when closing, so only stream formats keep memory
+    flat.
+    """
+
     def load(self):
         fd, temp_path = mkstemp(prefix='syntrend_')
         close(fd)
         self.args[TH_TEMP_PATH] = Path(temp_path)
+        self.args[TH_SPOOL] = self.args[TH_TEMP_PATH].open('ab')
+        self.args[TH_COUNT] = 0
         self.args['output_callback'] = lambda x: None
 
-    def write(self, event: Event, _=False):
-        if (
-            self.args[TH_TEMP_PATH].exists()
-            and self.args[TH_TEMP_PATH].stat().st_size > 0
-        ):
-            with open(self.args[TH_TEMP_PATH], 'rb') as t_file:
-                _buffer = pickle.load(t_file)
-        else:
-            _buffer = Collection()
-        _buffer.append(event)
-        with open(self.args[TH_TEMP_PATH], 'wb') as t_file:
-            pickle.dump(_buffer, t_file)
-
-    def get_collection(self) -> Collection:
-        with open(self.args[TH_TEMP_PATH], 'r+b') as t_file:
-            return pickle.load(t_file)
+    def write(self, event: Event):
+        pickle.dump(event, self.args[TH_SPOOL], protocol=pickle.HIGHEST_PROTOCOL)
+        self.args[TH_COUNT] += 1
+
+    def __len__(self):
+        return self.args[TH_COUNT]
+
+    def get_collection(self) -> Iterator[Event]:
+        self.args[TH_SPOOL].flush()
+        with self.args[TH_TEMP_PATH].open('rb') as t_file:
+            for _ in range(self.args[TH_COUNT]):
+                yield pickle.load(t_file)
 
     def close(self):
+        self.args[TH_SPOOL].close()
         self.args[TH_TEMP_PATH].unlink(missing_ok=True)
 
 
@@ -79,9 +95,116 @@ def register_formatter(format_name: str):
     return _register_formatter
 
 
-def load_formatter(object_name: str) -> Formatter:
+def register_stream_formatter(format_name: str):
+    """Registers a formatter able to write a collection incrementally.
+
+    The decorated function returns a `StreamFormatter` of callables producing
+    pre-joined chunks of text: `header()` once before the first row, `rows(events)`
+    for each batch of events as they arrive and `footer()` once when closing.
+    Outputs of single events also write each event with `rows`, expecting empty
+    headers and footers.
+    """
+    if format_name in STREAM_FORMATTERS:
+        raise NameError(f'Stream Formatter for {format_name} is already registered')
+
+    def _register_stream_formatter(func: T_StreamFormatter):
+        STREAM_FORMATTERS[format_name] = func
+        return func
+
+    return _register_stream_formatter
+
+
+def load_stream_formatter(
+    object_name: str, output_handler: writers.OutputHandler
+) -> Formatter:
+    stream_formatter = STREAM_FORMATTERS[CONFIG.objects[object_name].output.format](
+        object_name
+    )
+    if header := stream_formatter.header():
+        output_handler.write(header)
+
+    def __handle_events(event: dict):
+        output_handler.write(stream_formatter.rows(Collection(Event(event))))
+
+    def __handle_close():
+        if footer := stream_formatter.footer():
+            output_handler.write(footer)
+        output_handler.close()
+
+    return Formatter(__handle_events, __handle_close)
+
+
+def load_queued_formatter(
+    object_name: str, formatter: Formatter, queue_size: int
+) -> Formatter:
+    """Moves formatting and writing of an object's events to a writer thread.
+
+    Events are passed to the thread through a queue bounded to `queue_size` events,
+    blocking generation once the output falls that far behind. Errors raised by
+    the thread are raised on the next event written or when closing, after closing
+    the wrapped formatter.
+    """
+    events = queue.Queue(maxsize=queue_size)
+    errors = []
+
+    def __writer():
+        while (event := events.get()) is not QUEUE_CLOSE:
+            if errors:
+                continue
+            try:
+                formatter.format(event)
+            except Exception as e:
+                errors.append(e)
+
+    writer_thread = threading.Thread(
+        target=__writer, name=f'syntrend-writer-{object_name}', daemon=True
+    )
+    writer_thread.start()
+
+    def __raise_errors():
+        if errors:
+            raise errors[0]
+
+    def __handle_events(event: dict):
+        __raise_errors()
+        events.put(event)
+
+    def __handle_close():
+        events.put(QUEUE_CLOSE)
+        writer_thread.join()
+        try:
+            __raise_errors()
+        finally:
+            # Files, connections or compressors are released even after failures
+            formatter.close()
+
+    return Formatter(__handle_events, __handle_close)
+
+
+def load_formatter(object_name: str, sequence: int = 0) -> Formatter:
+    queue_size = int(CONFIG.objects[object_name].output.kwargs.get('queue_size', 0))
+    if queue_size < 0:
+        raise ValueError("Output 'queue_size' must be >= 0")
+    formatter = _load_formatter(object_name, sequence)
+    if queue_size:
+        return load_queued_formatter(object_name, formatter, queue_size)
+    return formatter
+
+
+def load_sink(object_name: str) -> Formatter:
+    """Passes the events of an object straight to the sink of its format"""
+    sink = writers.SINKS[CONFIG.objects[object_name].output.format](object_name)
+    sink.load()
+    return Formatter(sink.write, sink.close)
+
+
+def _load_formatter(object_name: str, sequence: int) -> Formatter:
     output_config = CONFIG.objects[object_name].output
-    output_handler = writers.setup_event_stream(object_name)
+    if output_config.format in writers.SINKS:
+        return load_sink(object_name)
+    output_handler = writers.setup_event_stream(object_name, sequence)
+    if output_config.format in STREAM_FORMATTERS:
+        return load_stream_formatter(object_name, output_handler)
     formatter = FORMATTERS[output_config.format](object_name)
     if output_config.collection:
         temp_collector = TempHandler(object_name)
@@ -90,22 +213,16 @@ def load_formatter(object_name: str) -> Formatter:
         temp_collector = writers.OutputHandler(object_name)
 
     def __handle_events(event: dict):
-        clear_target = False
         event = Event(event)
         if output_config.collection:
             temp_collector.write(event)
-            if isinstance(output_handler, writers.ConsoleHandler):
-                return
-            clear_target = True
-            event = temp_collector.get_collection()
-        else:
-            event = Collection(event)
-        formatted_output = formatter(event)
-        output_handler.write(linesep.join(formatted_output) + linesep, clear_target)
+            return
+        formatted_output = formatter(Collection(event))
+        output_handler.write(linesep.join(formatted_output) + linesep)
 
     def __handle_close():
         if output_config.collection:
-            events = temp_collector.get_collection()
+            events = Collection(*temp_collector.get_collection())
             formatted_output = formatter(events)
             output_handler.write(linesep.join(formatted_output) + linesep)
         temp_collector.close()
@@ -1,31 +1,106 @@
-from syntrend.formatters import register_formatter, Collection
+from syntrend.formatters import (
+    register_formatter,
+    register_stream_formatter,
+    Collection,
+    StreamFormatter,
+)
 from syntrend.config import CONFIG
 
+from os import linesep
+import csv
+
 DEFAULT_LINESEP = '\r\n'
+DIALECT_OPTIONS = {
+    'csv_delimiter': 'delimiter',
+    'csv_quotechar': 'quotechar',
+}
+
+
+class ChunkBuffer:
+    """Text target of a csv writer, collecting the rows written to a single chunk
+
+    `write` is the bound `append` of the list of parts, as csv writers hold on to
+    the `write` method of their target.
+    """
+
+    __slots__ = ('parts', 'write')
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.write = self.parts.append
+
+    def pop(self) -> str:
+        """Joined content written since the last call"""
+        chunk = ''.join(self.parts)
+        self.parts.clear()
+        return chunk
+
+
+def writer_options(object_name: str, lineterminator: str) -> dict:
+    """Formatting options of the csv writer of an object
+
+    Options default to quoting non-numeric values, unless the output names one of
+    the `csv` module's dialects (ie. `excel-tab` or `unix`) in `csv_dialect`.
+    `csv_delimiter` and `csv_quotechar` override the options of either.
+    """
+    kwargs = CONFIG.objects[object_name].output.kwargs
+    if 'csv_dialect' in kwargs:
+        options = {'dialect': csv.get_dialect(kwargs['csv_dialect'])}
+    else:
+        options = {'quoting': csv.QUOTE_NONNUMERIC, 'lineterminator': lineterminator}
+    for kwarg, option in DIALECT_OPTIONS.items():
+        if kwarg in kwargs:
+            options[option] = str(kwargs[kwarg])
+    return options
+
+
+def _rows(field_names: list[str], events: Collection):
+    return ([event.get(field, '') for field in field_names] for event in events)
 
 
 @register_formatter('csv')
 def csv_formatter(object_name: str):
-    import csv
-    from io import StringIO
+    buffer = ChunkBuffer()
+    # Rows are kept as separate lines, so the writer doesn't terminate them
+    options = writer_options(object_name, DEFAULT_LINESEP) | {'lineterminator': ''}
+    csv_writer = csv.writer(buffer, **options)
+    output_options = CONFIG.objects[object_name].output
+    field_names = []
+
+    def __formatter(events: Collection) -> list[str]:
+        if not field_names:
+            field_names.extend(events[0])
+        if output_options.collection:
+            csv_writer.writerow(field_names)
+        csv_writer.writerows(_rows(field_names, events))
+        lines = buffer.parts.copy()
+        buffer.parts.clear()
+        lines.append('')
+        return lines
 
-    buffer = StringIO()
-    csv_writer = csv.DictWriter(buffer, {}, quoting=csv.QUOTE_NONNUMERIC)
+    return __formatter
+
+
+@register_stream_formatter('csv')
+def csv_stream_formatter(object_name: str) -> StreamFormatter:
+    buffer = ChunkBuffer()
+    csv_writer = csv.writer(buffer, **writer_options(object_name, linesep))
     output_options = CONFIG.objects[object_name].output
+    field_names = []
 
-    def _write_events(events: list[dict[str, object]]):
-        for event in events:
-            csv_writer.writerow(event)
+    def __header() -> str:
+        return ''
 
-    def __formatter(event: Collection) -> list[str]:
-        buffer.seek(0)
-        buffer.truncate()
+    def __rows(events: Collection) -> str:
+        if not field_names:
+            # Header is deferred until the first event provides the field names
+            field_names.extend(events[0])
+            if output_options.collection:
+                csv_writer.writerow(field_names)
+        csv_writer.writerows(_rows(field_names, events))
+        return buffer.pop()
 
-        if not csv_writer.fieldnames:
-            csv_writer.fieldnames = list(event[0])
-        if output_options.collection:
-            csv_writer.writeheader()
-        _write_events(event)
-        return buffer.getvalue().split(DEFAULT_LINESEP)
+    def __footer() -> str:
+        return ''
 
-    return __formatter
+    return StreamFormatter(__header, __rows, __footer)
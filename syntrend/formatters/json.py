@@ -1,29 +1,118 @@
 from syntrend.config import CONFIG
-from syntrend.formatters import register_formatter, Collection
+from syntrend.formatters import (
+    register_formatter,
+    register_stream_formatter,
+    Collection,
+    Event,
+    StreamFormatter,
+)
 
-ROW_FORMAT = '{row_indent}{content}{sep}'
+from os import linesep
+from typing import Callable
+import json
+import logging
+
+LOG = logging.getLogger(__name__)
+ENCODER_JSON = 'json'
+ENCODER_ORJSON = 'orjson'
+ENCODERS = (ENCODER_JSON, ENCODER_ORJSON)
+T_Encoder = Callable[[object], str]
+
+
+def load_encoder(object_name: str) -> T_Encoder:
+    """Loads the function encoding values of an object to JSON
+
+    The `json_encoder` output kwarg selects the encoder: `json` (default) reuses a
+    single instance of the standard library's encoder and `orjson` encodes through
+    the `orjson` package, writing compact separators. Without `orjson` installed,
+    values are encoded by `json`.
+    """
+    encoder_name = CONFIG.objects[object_name].output.kwargs.get(
+        'json_encoder', ENCODER_JSON
+    )
+    if encoder_name not in ENCODERS:
+        raise ValueError(f"Output 'json_encoder' must be one of {', '.join(ENCODERS)}")
+    if encoder_name == ENCODER_ORJSON:
+        try:
+            import orjson
+        except ImportError:
+            LOG.warning("orjson is not installed, falling back to the 'json' encoder")
+        else:
+            dumps = orjson.dumps
+            return lambda value: dumps(value).decode()
+    return json.JSONEncoder().encode
+
+
+def _content(event: Event):
+    return event['value'] if event.use_default else event
 
 
 @register_formatter('json')
 def json_formatter(object_name: str):
-    import json
+    encode = load_encoder(object_name)
+    is_collection = CONFIG.objects[object_name].output.collection
+
+    def __formatter(events: Collection) -> list[str]:
+        rows = [encode(_content(event)) for event in events]
+        if not is_collection:
+            return rows
+        return [
+            '[',
+            *[f'  {row},' for row in rows[:-1]],
+            *[f'  {row}' for row in rows[-1:]],
+            ']',
+        ]
+
+    return __formatter
+
 
+@register_stream_formatter('json')
+def json_stream_formatter(object_name: str) -> StreamFormatter:
+    encode = load_encoder(object_name)
     is_collection = CONFIG.objects[object_name].output.collection
+    row_count = [0]
+
+    def __header() -> str:
+        return '[' if is_collection else ''
+
+    def __rows(events: Collection) -> str:
+        if not is_collection:
+            return ''.join([encode(_content(event)) + linesep for event in events])
+        # Separators lead each row as the last row isn't known until closing
+        separator = f',{linesep}  ' if row_count[0] else f'{linesep}  '
+        row_count[0] += len(events)
+        return separator + f',{linesep}  '.join(
+            [encode(_content(event)) for event in events]
+        )
+
+    def __footer() -> str:
+        return f'{linesep}]{linesep}' if is_collection else ''
+
+    return StreamFormatter(__header, __rows, __footer)
+
+
+@register_formatter('jsonl')
+def jsonl_formatter(object_name: str):
+    encode = load_encoder(object_name)
 
     def __formatter(events: Collection) -> list[str]:
-        buffer = ['['] if is_collection else []
-        row_buffer = '  ' if is_collection else ''
-        event_count = len(events)
-        for idx, event in enumerate(events):
-            buffer.append(
-                ROW_FORMAT.format(
-                    row_indent=row_buffer,
-                    content=json.dumps(event['value'] if event.use_default else event),
-                    sep=',' if idx < event_count - 1 and is_collection else '',
-                )
-            )
-        if is_collection:
-            buffer.append(']')
-        return buffer
+        return [encode(_content(event)) for event in events]
 
     return __formatter
+
+
+@register_stream_formatter('jsonl')
+def jsonl_stream_formatter(object_name: str) -> StreamFormatter:
+    """Writes each event as a line of JSON, for events as well as collections"""
+    encode = load_encoder(object_name)
+
+    def __header() -> str:
+        return ''
+
+    def __rows(events: Collection) -> str:
+        return ''.join([encode(_content(event)) + linesep for event in events])
+
+    def __footer() -> str:
+        return ''
+
+    return StreamFormatter(__header, __rows, __footer)
@@ -1,31 +1,169 @@
+"""SQL statements loading the generated events into a table named after the object.
+
+Events are written as `insert` statements, batching `sql_batch_size` rows per
+statement for collections, or as a PostgreSQL `copy ... from stdin` block of
+tab-separated rows when `sql_mode` is `copy`.
+"""
+
 from syntrend.config import CONFIG
-from syntrend.formatters import register_formatter, Collection
+from syntrend.formatters import (
+    register_formatter,
+    register_stream_formatter,
+    Collection,
+    StreamFormatter,
+)
 
-SQL_INSERT_FORMAT = 'insert into {table} ({columns}) values ({values})'
+from datetime import date, time, timedelta
+from os import linesep
+import json
+import math
+import re
 
+SQL_INSERT_FORMAT = 'insert into {table} ({columns}) values {rows};'
+SQL_COPY_FORMAT = 'copy {table} ({columns}) from stdin;'
+SQL_COPY_END = '\\.'
+SQL_MODE_INSERT = 'insert'
+SQL_MODE_COPY = 'copy'
+SQL_MODES = (SQL_MODE_INSERT, SQL_MODE_COPY)
+RE_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+COPY_ESCAPES = str.maketrans(
+    {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\b': '\\b', '\f': '\\f'}
+)
+ROW_SEPARATOR = f',{linesep}  '
+
+
+def _format_identifier(name: str) -> str:
+    if RE_IDENTIFIER.match(name):
+        return name
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _format_text(value) -> str | None:
+    """Text of a value, `None` for SQL's NULL"""
+    if value is None:
+        return None
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return f'{value.total_seconds()} seconds'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
 
-@register_formatter('sql')
-def sql_formatter(object_name: str):
-    _ = CONFIG.objects[object_name].output  # To satisfy testing and lint requirements
 
-    def __format_value(value):
-        if isinstance(value, str):
-            return f'"{str(value)}"'
+def _format_value(value) -> str:
+    """Literal of a value in an `insert` statement"""
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
         return str(value)
+    text = _format_text(value)
+    if text is None:
+        return 'NULL'
+    return "'{}'".format(text.replace("'", "''"))
+
+
+def _format_copy_value(value) -> str:
+    """Field of a value in a `copy` row"""
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    text = _format_text(value)
+    if text is None:
+        return '\\N'
+    return text.translate(COPY_ESCAPES)
+
+
+def _format_columns(event: dict) -> str:
+    return ', '.join(map(_format_identifier, event))
+
+
+def _format_insert(table: str, events: Collection) -> str:
+    return SQL_INSERT_FORMAT.format(
+        table=table,
+        columns=_format_columns(events[0]),
+        rows=ROW_SEPARATOR.join(
+            '({})'.format(', '.join(map(_format_value, event.values())))
+            for event in events
+        ),
+    )
+
 
-    def __format_event(event: dict) -> str:
-        return SQL_INSERT_FORMAT.format(
-            table=object_name,
-            columns=', '.join(list(event)),
-            values=', '.join(map(__format_value, event.values())),
-        )
+def _format_copy_rows(events: Collection) -> list[str]:
+    return ['\t'.join(map(_format_copy_value, event.values())) for event in events]
+
+
+def _load_options(object_name: str) -> tuple[str, str, int]:
+    """Table name, mode and number of rows per statement of an object's output"""
+    output_options = CONFIG.objects[object_name].output
+    mode = output_options.kwargs.get('sql_mode', SQL_MODE_INSERT)
+    if mode not in SQL_MODES:
+        raise ValueError(f"Output 'sql_mode' must be one of {', '.join(SQL_MODES)}")
+    batch_size = int(output_options.kwargs.get('sql_batch_size', 1))
+    if batch_size < 1:
+        raise ValueError("Output 'sql_batch_size' must be >= 1")
+    if not output_options.collection:
+        # Each event is written on its own
+        batch_size = 1
+    return _format_identifier(object_name), mode, batch_size
+
+
+@register_formatter('sql')
+def sql_formatter(object_name: str):
+    table, mode, batch_size = _load_options(object_name)
 
     def __formatter(events: Collection) -> list[str]:
-        return list(
-            map(
-                __format_event,
-                [ev if isinstance(ev, dict) else {'value': ev} for ev in events],
-            )
-        )
+        if mode == SQL_MODE_COPY:
+            return [
+                SQL_COPY_FORMAT.format(table=table, columns=_format_columns(events[0])),
+                *_format_copy_rows(events),
+                SQL_COPY_END,
+            ]
+        return [
+            _format_insert(table, events[idx : idx + batch_size])
+            for idx in range(0, len(events), batch_size)
+        ]
 
     return __formatter
+
+
+@register_stream_formatter('sql')
+def sql_stream_formatter(object_name: str) -> StreamFormatter:
+    table, mode, batch_size = _load_options(object_name)
+    is_collection = CONFIG.objects[object_name].output.collection
+    pending = Collection()
+    copy_started = [False]
+
+    def __header() -> str:
+        return ''
+
+    def __copy_rows(events: Collection) -> str:
+        lines = _format_copy_rows(events)
+        if not (is_collection and copy_started[0]):
+            # Columns are known once the first event is written
+            header = SQL_COPY_FORMAT.format(
+                table=table, columns=_format_columns(events[0])
+            )
+            lines.insert(0, header)
+            copy_started[0] = True
+        if not is_collection:
+            lines.append(SQL_COPY_END)
+        return ''.join(line + linesep for line in lines)
+
+    def __rows(events: Collection) -> str:
+        if mode == SQL_MODE_COPY:
+            return __copy_rows(events)
+        pending.extend(events)
+        statements = []
+        while len(pending) >= batch_size:
+            statements.append(_format_insert(table, pending[:batch_size]) + linesep)
+            del pending[:batch_size]
+        return ''.join(statements)
+
+    def __footer() -> str:
+        if mode == SQL_MODE_COPY:
+            return SQL_COPY_END + linesep if is_collection and copy_started[0] else ''
+        if not pending:
+            return ''
+        return _format_insert(table, pending) + linesep
+
+    return StreamFormatter(__header, __rows, __footer)
@@ -2,6 +2,8 @@ from typing import Type, Callable, Union
 
 
 class BaseType:
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(self, *args, **kwargs)
 
@@ -22,6 +24,8 @@ class BaseType:
 
 
 class CollectionType(BaseType):
+    __slots__ = ()
+
     def __getitem__(self, item):
         return self.render()[item]
 
@@ -33,6 +37,8 @@ class CollectionType(BaseType):
 
 
 class BooleanType(BaseType):
+    __slots__ = ()
+
     def __and__(self, other):
         return self.render() & other
 
@@ -53,6 +59,8 @@ class BooleanType(BaseType):
 
 
 class NumericType(BaseType):
+    __slots__ = ()
+
     def __int__(self):
         return int(self.render())
 
@@ -118,10 +126,12 @@ class NumericType(BaseType):
 
 
 class StringType(CollectionType):
-    pass
+    __slots__ = ()
 
 
 class IntegerType(NumericType):
+    __slots__ = ()
+
     def __rshift__(self, other):
         return self.render() >> other
 
@@ -130,15 +140,19 @@ class IntegerType(NumericType):
 
 
 class FloatType(NumericType):
+    __slots__ = ()
+
     def __round__(self, n=None):
         return round(self.render(), n)
 
 
 class ListType(CollectionType):
-    pass
+    __slots__ = ()
 
 
 class MappingType(CollectionType):
+    __slots__ = ()
+
     def __getattr__(self, name):
         return self.properties[name]
 
@@ -195,13 +209,23 @@ TYPE_MAPPING = load_type_method_mapping()
 
 
 def load_type(generator):
+    """Builds the class of a generator used in expressions
+
+    The class extends the generator with the expression type of its values, so
+    generators act as their current value in expressions (ie. `this().count + 1`).
+    Generator methods take precedence over the ones of the expression type.
+    """
     if generator.type is None:
         return generator
     base_type = EXPRESSION_TYPES[generator.type]
-    if base_type in generator.__bases__:
+    if issubclass(generator, base_type):
         return generator
     return type(
         generator.__name__,
-        tuple(list(generator.__bases__) + [base_type]),
-        generator.__dict__ | base_type.__dict__,
+        (generator, base_type),
+        {
+            '__slots__': (),
+            '__module__': generator.__module__,
+            '__doc__': generator.__doc__,
+        },
     )
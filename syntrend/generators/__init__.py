@@ -1,26 +1,83 @@
 from syntrend.config import model, CONFIG
-from syntrend.utils import distributions, exceptions
+from syntrend.utils import distributions, engine, exceptions
 from typing import Type, Callable
 from pathlib import Path
 from importlib import import_module
 from collections import namedtuple
+from functools import cache
 import logging
+import random
 
 from syntrend.generators.__base_types import load_type
 
 LOG = logging.getLogger(__name__)
 GENERATORS: dict[str, Type['PropertyGenerator']] = {}
+UNSET = object()
 
 
 def default_generator(new, **kwargs):
     return new
 
 
+class IterationFrame:
+    """Values rendered by the generators of an object at its current iteration.
+
+    Generators are allocated a slot of the frame when loaded and cache their value in
+    it until the frame moves to another iteration. Rolling back clears the values of
+    the iteration so it's rendered again.
+    """
+
+    __slots__ = ('iteration', 'values', 'size')
+
+    def __init__(self):
+        self.iteration = 0
+        self.values: list = []
+        self.size = 0
+
+    def allocate(self) -> int:
+        self.values.append(UNSET)
+        self.size += 1
+        return self.size - 1
+
+    def seek(self, iteration: int) -> None:
+        self.iteration = iteration
+        self.values = [UNSET] * self.size
+
+    def rollback(self) -> None:
+        self.values = [UNSET] * self.size
+
+
+@cache
+def struct_type(name: str, fields: tuple[str, ...]) -> type[tuple]:
+    """Named tuple type shared by all generators with the same fields"""
+    return namedtuple(name, fields)
+
+
 class PropertyGenerator:
+    __slots__ = (
+        'root_object',
+        'config',
+        'properties',
+        'items',
+        'expression',
+        'start',
+        'random',
+        'numpy_random',
+        '__distribution',
+        '__batch_distribution',
+        'modules',
+        'kwargs',
+        'root_manager',
+        'frame',
+        'slot',
+        'iteration_value',
+    )
     type: Type = None
     name: str = ''
     default_config: dict[str, any] = {}
     required_modules: list[str] = []
+    numeric_engine: bool = False
+    """Generator draws numeric batches through the configured engine"""
 
     def __init__(self, object_name: str, config: model.PropertyDefinition):
         self.root_object = object_name
@@ -29,35 +86,49 @@ class PropertyGenerator:
         self.items: list[any] = []
         self.expression: Callable = default_generator
         self.start = None
+        self.random = random.Random()
+        self.numpy_random = None
         self.__distribution = None
-
-        kwargs_names = list(self.config.kwargs)
-        __modules_nt_type = namedtuple('RequiredModules', self.required_modules)
-        __kwargs_nt_type = namedtuple(self.name, kwargs_names)
-        self.modules: __modules_nt_type = __modules_nt_type(*self.required_modules)
-        self.kwargs: __kwargs_nt_type = __kwargs_nt_type(**self.config.kwargs)
+        self.__batch_distribution = None
+        self.modules = struct_type('RequiredModules', tuple(self.required_modules))(
+            *self.required_modules
+        )
+        self.kwargs = struct_type(self.name, tuple(self.config.kwargs))(
+            **self.config.kwargs
+        )
         self.root_manager = None
-        self.iteration = -1
+        self.frame: IterationFrame | None = None
+        self.slot = 0
         self.iteration_value = None
-        self.__modules_nt_type = __modules_nt_type
-        self.__kwargs_nt_type = __kwargs_nt_type
 
     def __repr__(self):
         return f'<{self.__class__.__name__}: current={self.iteration_value}>'
 
     def load(self, manager):
         self.root_manager = manager
-        self.modules = self.__modules_nt_type(
+        if manager is not None:
+            self.random = manager.random_stream(self.root_object, self.config.name)
+            self.frame = manager.iteration_frame(self.root_object)
+        else:
+            self.frame = IterationFrame()
+        self.slot = self.frame.allocate()
+        self.modules = type(self.modules)(
             **{mod_name: import_module(mod_name) for mod_name in self.required_modules}
         )
         kwargs = self.load_kwargs(self.config.kwargs)
-        kwargs_tpl = namedtuple(self.name, list(kwargs))
         self.start = self.config.start
-        self.kwargs = kwargs_tpl(**kwargs)
+        self.kwargs = struct_type(self.name, tuple(kwargs))(**kwargs)
         self.properties = self.load_properties(self.config.properties)
         self.items = self.load_items(self.config.items)
         self.validate()
-        self.__distribution = distributions.get_distribution(self.config.distribution)
+        if self.numeric_engine:
+            self.numpy_random = engine.numpy_random(self.random.getrandbits(64))
+        self.__distribution = distributions.get_distribution(
+            self.config.distribution, self.random
+        )
+        self.__batch_distribution = distributions.get_batch_distribution(
+            self.config.distribution, self.numpy_random, self.random
+        )
         if self.config.expression and isinstance(self.config.expression, str):
             self.expression = manager.load_expression(self)
 
@@ -74,33 +145,65 @@ class PropertyGenerator:
         pass
 
     def render(self):
-        iteration = self.root_manager.current_iteration(self.root_object)
-        if self.iteration == iteration:
-            return self.iteration_value
+        frame = self.frame
+        value = frame.values[self.slot]
+        if value is not UNSET:
+            return value
 
-        self.iteration = iteration
+        iteration = frame.iteration
         if not iteration and self.start is not None:
-            self.iteration_value = self.start
+            frame.values[self.slot] = self.iteration_value = self.start
             return self.start
 
+        # Renders referencing this value while it's generated get the previous value
+        frame.values[self.slot] = self.iteration_value
         generated = self.generate()
         try:
             self.iteration_value = self.expression(
-                new=generated, interval=self.iteration, kwargs=self.kwargs
+                new=generated, interval=iteration, kwargs=self.kwargs
             )
         except exceptions.ExpressionError as e:
             exceptions.process_exception(e)
         self.iteration_value = self.__distribution(self.iteration_value)
         if self.type is not None and not isinstance(self.iteration_value, self.type):
             self.iteration_value = self.type(self.iteration_value)
+        frame.values[self.slot] = self.iteration_value
         return self.iteration_value
 
-    def undo(self):
-        self.iteration -= 1
+    def supports_batch(self) -> bool:
+        """Whether values can be rendered in chunks through `render_batch`.
+
+        Expressions may reference values from the current or previous iterations, so
+        only generators without an expression are rendered in batches.
+        """
+        return self.expression is default_generator
+
+    def render_batch(self, size: int) -> list:
+        """Renders `size` values for consecutive iterations, starting with the current
+        iteration of the root object. Only valid when `supports_batch()` is true.
+        """
+        iteration = self.frame.iteration
+        values = self.__batch_distribution(self.generate_batch(size))
+        if hasattr(values, 'tolist'):
+            # Arrays from the NumPy engine are converted back to Python values
+            values = values.tolist()
+        if self.type is not None:
+            _type = self.type
+            values = [
+                value if isinstance(value, _type) else _type(value) for value in values
+            ]
+        if not iteration and self.start is not None:
+            values[0] = self.start
+        # Values referenced after the batch are those of its last iteration
+        self.frame.values[self.slot] = self.iteration_value = values[-1]
+        return values
 
     def generate(self):
         raise NotImplementedError('Generator has not implemented `generate` method')
 
+    def generate_batch(self, size: int) -> list:
+        return [self.generate() for _ in range(size)]
+
 
 def register(property_generator: Type[PropertyGenerator]):
     assert property_generator.name, 'Property Generator must have a name specified'
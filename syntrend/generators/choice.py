@@ -1,13 +1,16 @@
-from random import randint
 from syntrend.generators import register, PropertyGenerator
 
 
 @register
 class ChoiceGenerator(PropertyGenerator):
+    __slots__ = ()
     name = 'choice'
 
     def validate(self):
         assert len(self.items) > 0, 'Cannot generate items from an empty list'
 
     def generate(self):
-        return self.items[randint(0, len(self.items) - 1)]
+        return self.items[self.random.randint(0, len(self.items) - 1)]
+
+    def generate_batch(self, size: int) -> list[any]:
+        return self.random.choices(self.items, k=size)
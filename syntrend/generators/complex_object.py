@@ -1,9 +1,13 @@
+from syntrend.config import model
 from syntrend.generators import register, PropertyGenerator, get_generator
 
-from random import randint
-
 
 class BaseComplexGenerator(PropertyGenerator):
+    __slots__ = ()
+
+    def supports_batch(self) -> bool:
+        return False
+
     def get_children(self) -> list[str]:
         raise NotImplementedError(
             f"{str(type(self))}: 'get_children' is not implemented"
@@ -14,6 +18,7 @@ class BaseComplexGenerator(PropertyGenerator):
 class UnionGeneratorBase(BaseComplexGenerator):
     """Generates a single value based on a random selection of many provided generator options"""
 
+    __slots__ = ()
     name = 'union'
 
     def get_children(self):
@@ -26,13 +31,14 @@ class UnionGeneratorBase(BaseComplexGenerator):
         return _gens
 
     def generate(self) -> any:
-        return self.items[randint(0, len(self.items) - 1)].render()
+        return self.items[self.random.randint(0, len(self.items) - 1)].render()
 
 
 @register
 class ListGeneratorBase(BaseComplexGenerator):
     """Generates a list-object of 1 or many values of the specified generator type"""
 
+    __slots__ = ()
     name = 'list'
     default_config = {
         'min_length': 1,
@@ -52,14 +58,22 @@ class ListGeneratorBase(BaseComplexGenerator):
         assert (
             'sub_type' in kwargs
         ), "Must provide a 'sub_type' property for the values to be generated"
+        sub_type = kwargs['sub_type']
+        if isinstance(sub_type, str):
+            sub_type = {'type': sub_type}
+        if isinstance(sub_type, dict):
+            sub_type = model.PropertyDefinition(name=self.config.name, **sub_type)
         kwargs['sub_type'] = get_generator(
-            self.root_object, kwargs['sub_type'], self.root_manager
+            self.root_object, sub_type, self.root_manager
         )
+        return kwargs
 
     def generate(self) -> list[any]:
         return [
             self.kwargs.sub_type.render()
-            for _ in range(randint(self.kwargs.min_length, self.kwargs.max_length))
+            for _ in range(
+                self.random.randint(self.kwargs.min_length, self.kwargs.max_length)
+            )
         ]
 
 
@@ -67,6 +81,7 @@ class ListGeneratorBase(BaseComplexGenerator):
 class ObjectGeneratorBase(BaseComplexGenerator):
     """Generates an object based on a defined mapping of properties"""
 
+    __slots__ = ('render_order',)
     name = 'object'
     type = dict
 
@@ -76,17 +91,25 @@ class ObjectGeneratorBase(BaseComplexGenerator):
     def load_properties(
         self, properties: dict[str, any]
     ) -> dict[str, PropertyGenerator]:
+        # Properties referenced by siblings are moved first once dependencies are
+        # resolved (see `utils.dependencies.resolve`)
+        self.render_order = list(properties)
         return {
             key: get_generator(self.root_object, properties[key], self.root_manager)
             for key in properties
         }
 
+    def supports_batch(self) -> bool:
+        return super(BaseComplexGenerator, self).supports_batch() and all(
+            prop.supports_batch() for prop in self.properties.values()
+        )
+
     def generate(self):
-        for key in self.properties:
-            self.properties[key].render()
-        return {key: self.properties[key].render() for key in self.properties}
-
-    def undo(self):
-        super(BaseComplexGenerator, self).undo()
-        for key in self.properties:
-            self.properties[key].undo()
+        values = {key: self.properties[key].render() for key in self.render_order}
+        return {key: values[key] for key in self.properties}
+
+    def generate_batch(self, size: int) -> list[dict]:
+        columns = {
+            key: self.properties[key].render_batch(size) for key in self.properties
+        }
+        return [{key: columns[key][idx] for key in columns} for idx in range(size)]
@@ -35,6 +35,7 @@ def datetime_aware(kwargs):
 
 @register
 class DateTimeGenerator(PropertyGenerator):
+    __slots__ = ()
     type = str
     name = 'datetime'
     default_config = {
@@ -60,6 +61,7 @@ class DateTimeGenerator(PropertyGenerator):
 
 @register
 class TimestampGenerator(PropertyGenerator):
+    __slots__ = ()
     type = int
     name = 'timestamp'
     default_config = {
@@ -3,6 +3,7 @@ from syntrend.generators import register, PropertyGenerator
 
 @register
 class FloatGenerator(PropertyGenerator):
+    __slots__ = ()
     type = float
     name = 'float'
     default_config = {
@@ -10,7 +11,7 @@ class FloatGenerator(PropertyGenerator):
         'max_offset': 500.0,
         'num_decimals': 6,
     }
-    required_modules = ['random']
+    numeric_engine = True
 
     def load_kwargs(self, kwargs: dict[str, any]) -> dict[str, any]:
         kwargs['min_offset'] = float(kwargs['min_offset'])
@@ -25,6 +26,19 @@ class FloatGenerator(PropertyGenerator):
 
     def generate(self):
         return round(
-            self.modules.random.random() * self.kwargs.range + self.kwargs.min_offset,
+            self.random.random() * self.kwargs.range + self.kwargs.min_offset,
             self.kwargs.num_decimals,
         )
+
+    def generate_batch(self, size: int) -> list[float]:
+        if self.numpy_random is not None:
+            return (
+                self.numpy_random.random(size) * self.kwargs.range
+                + self.kwargs.min_offset
+            ).round(self.kwargs.num_decimals)
+        rand = self.random.random
+        value_range, min_offset = self.kwargs.range, self.kwargs.min_offset
+        num_decimals = self.kwargs.num_decimals
+        return [
+            round(rand() * value_range + min_offset, num_decimals) for _ in range(size)
+        ]
@@ -3,13 +3,14 @@ from syntrend.generators import register, PropertyGenerator
 
 @register
 class IntegerGenerator(PropertyGenerator):
+    __slots__ = ()
     type = int
     name = 'integer'
     default_config = {
         'min_offset': -500,
         'max_offset': 500,
     }
-    required_modules = ['random']
+    numeric_engine = True
 
     def load_kwargs(self, kwargs: dict[str, any]) -> dict[str, any]:
         kwargs['min_offset'] = int(kwargs['min_offset'])
@@ -21,6 +22,13 @@ class IntegerGenerator(PropertyGenerator):
             raise ValueError('Min Offset must be less than or equal to Max Offset')
 
     def generate(self):
-        return self.modules.random.randint(
-            self.kwargs.min_offset, self.kwargs.max_offset
+        return self.random.randint(self.kwargs.min_offset, self.kwargs.max_offset)
+
+    def generate_batch(self, size: int) -> list[int]:
+        if self.numpy_random is not None:
+            return self.numpy_random.integers(
+                self.kwargs.min_offset, self.kwargs.max_offset, size=size, endpoint=True
+            )
+        return self.random.choices(
+            range(self.kwargs.min_offset, self.kwargs.max_offset + 1), k=size
         )
@@ -1,32 +1,45 @@
-from syntrend.generators import register, PropertyGenerator
+from syntrend.generators import PropertyGenerator, register
 
 from faker import Faker
 
-fake = Faker()
+
+class FakerGenerator(PropertyGenerator):
+    """Base for generators using their own `Faker` instance seeded from the
+    generator's random stream"""
+
+    __slots__ = ('fake',)
+
+    def load(self, manager):
+        super().load(manager)
+        self.fake = Faker()
+        self.fake.seed_instance(self.random.getrandbits(64))
 
 
 @register
-class NameGenerator(PropertyGenerator):
+class NameGenerator(FakerGenerator):
+    __slots__ = ()
     type = str
     name = 'name'
 
     def generate(self):
-        return fake.name()
+        return self.fake.name()
 
 
 @register
-class FirstNameGenerator(PropertyGenerator):
+class FirstNameGenerator(FakerGenerator):
+    __slots__ = ()
     type = str
     name = 'first_name'
 
     def generate(self):
-        return fake.first_name()
+        return self.fake.first_name()
 
 
 @register
-class LastNameGenerator(PropertyGenerator):
+class LastNameGenerator(FakerGenerator):
+    __slots__ = ()
     type = str
     name = 'last_name'
 
     def generate(self):
-        return fake.last_name()
+        return self.fake.last_name()
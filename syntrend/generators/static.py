@@ -3,6 +3,7 @@ from syntrend.generators import register, PropertyGenerator
 
 @register
 class StaticGenerator(PropertyGenerator):
+    __slots__ = ()
     name = 'static'
 
     def validate(self):
@@ -11,3 +12,6 @@ class StaticGenerator(PropertyGenerator):
 
     def generate(self):
         return self.kwargs.value
+
+    def generate_batch(self, size: int) -> list[any]:
+        return [self.kwargs.value] * size
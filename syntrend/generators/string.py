@@ -1,10 +1,28 @@
 from syntrend.generators import register, PropertyGenerator
 
-from random import randint
+import random
+
+
+def _join_batch(
+    random_stream: random.Random,
+    chars: str,
+    min_length: int,
+    max_length: int,
+    size: int,
+) -> list[str]:
+    """Draws the characters for a batch of strings at once and splits them apart"""
+    lengths = random_stream.choices(range(min_length, max_length + 1), k=size)
+    drawn = random_stream.choices(chars, k=sum(lengths))
+    values, offset = [], 0
+    for length in lengths:
+        values.append(''.join(drawn[offset : offset + length]))
+        offset += length
+    return values
 
 
 @register
 class StringGenerator(PropertyGenerator):
+    __slots__ = ()
     name = 'string'
     type = str
     default_config = {
@@ -33,14 +51,26 @@ class StringGenerator(PropertyGenerator):
     def generate(self):
         return ''.join(
             [
-                self.kwargs.chars[randint(0, len(self.kwargs.chars) - 1)]
-                for _ in range(randint(self.kwargs.min_length, self.kwargs.max_length))
+                self.kwargs.chars[self.random.randint(0, len(self.kwargs.chars) - 1)]
+                for _ in range(
+                    self.random.randint(self.kwargs.min_length, self.kwargs.max_length)
+                )
             ]
         )
 
+    def generate_batch(self, size: int) -> list[str]:
+        return _join_batch(
+            self.random,
+            self.kwargs.chars,
+            self.kwargs.min_length,
+            self.kwargs.max_length,
+            size,
+        )
+
 
 @register
 class HexGenerator(StringGenerator):
+    __slots__ = ()
     name = 'hex'
     default_config = {
         'use_upper': False,
@@ -67,7 +97,18 @@ class HexGenerator(StringGenerator):
     def generate(self):
         return ''.join(
             [
-                self.kwargs.chars[randint(0, self.kwargs.char_length)]
-                for _ in range(randint(self.kwargs.min_length, self.kwargs.max_length))
+                self.kwargs.chars[self.random.randint(0, self.kwargs.char_length)]
+                for _ in range(
+                    self.random.randint(self.kwargs.min_length, self.kwargs.max_length)
+                )
             ]
         )
+
+    def generate_batch(self, size: int) -> list[str]:
+        return _join_batch(
+            self.random,
+            self.kwargs.chars[: self.kwargs.char_length + 1],
+            self.kwargs.min_length,
+            self.kwargs.max_length,
+            size,
+        )
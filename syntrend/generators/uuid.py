@@ -3,6 +3,7 @@ from syntrend.generators import register, PropertyGenerator
 
 @register
 class UUIDGenerator(PropertyGenerator):
+    __slots__ = ()
     type = str
     name = 'uuid'
     default_config = {
@@ -19,7 +20,19 @@ class UUIDGenerator(PropertyGenerator):
         return kwargs
 
     def generate(self):
-        uuid_val = self.modules.uuid.uuid4()
+        return self._format(
+            self.modules.uuid.UUID(int=self.random.getrandbits(128), version=4)
+        )
+
+    def generate_batch(self, size: int) -> list[str]:
+        random_bytes = self.random.randbytes(16 * size)
+        uuid_cls = self.modules.uuid.UUID
+        return [
+            self._format(uuid_cls(bytes=random_bytes[idx : idx + 16], version=4))
+            for idx in range(0, 16 * size, 16)
+        ]
+
+    def _format(self, uuid_val) -> str:
         if self.kwargs.compact:
             uuid_val = uuid_val.hex
         uuid_val = str(uuid_val).replace('-', self.kwargs.separator)
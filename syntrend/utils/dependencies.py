@@ -0,0 +1,353 @@
+"""Dependency graph of properties referenced by expressions.
+
+Expressions referencing the current iteration of an object (`this().prop`,
+`this(0).prop`, `path('this.prop')`) depend on the referenced property being
+rendered first. References to previous iterations (`this(1).prop`) are served by
+the historian and don't add dependencies, they decide which parts of previous
+values the historian of each object keeps instead (see `find_history`).
+
+Properties are identified by their path, starting with the object name, ie.
+`('this', 'prop', 'sub_prop')`. Objects depend on all their properties.
+"""
+
+from syntrend.generators import PropertyGenerator
+from syntrend.utils.historian import (
+    DEFAULT_FIELD,
+    FULL_HISTORY,
+    NO_HISTORY,
+    HistoryProjection,
+)
+
+from jinja2 import Environment, nodes
+from jinja2.parser import Parser
+
+from graphlib import CycleError, TopologicalSorter
+
+T_Path = tuple[str, ...]
+
+
+def _object_reference(node: nodes.Node, object_names: set[str]) -> T_Path | None:
+    """Path of an object call (`obj()`/`obj(0)`/`path('obj.prop')`) at its current
+    iteration, `None` for any other node"""
+    if not (isinstance(node, nodes.Call) and isinstance(node.node, nodes.Name)):
+        return None
+    if node.kwargs or node.dyn_args or node.dyn_kwargs:
+        return None
+    name = node.node.name
+    if name == 'path' and len(node.args) == 1:
+        arg = node.args[0]
+        if isinstance(arg, nodes.Const) and isinstance(arg.value, str):
+            path = tuple(arg.value.split('.'))
+            if path[0] in object_names:
+                return path
+        return None
+    if name not in object_names:
+        return None
+    if not node.args or (
+        len(node.args) == 1
+        and isinstance(node.args[0], nodes.Const)
+        and node.args[0].value == 0
+    ):
+        return (name,)
+    return None
+
+
+def _unwrap_attributes(node: nodes.Node) -> tuple[nodes.Node, T_Path]:
+    """Node an attribute/item chain (ie. `x.a["b"]`) is applied to and the names
+    of its attributes"""
+    attributes = []
+    while True:
+        if isinstance(node, nodes.Getattr):
+            attributes.append(node.attr)
+        elif (
+            isinstance(node, nodes.Getitem)
+            and isinstance(node.arg, nodes.Const)
+            and isinstance(node.arg.value, str)
+        ):
+            attributes.append(node.arg.value)
+        else:
+            break
+        node = node.node
+    return node, tuple(reversed(attributes))
+
+
+def _attribute_path(node: nodes.Node, object_names: set[str]) -> T_Path | None:
+    node, attributes = _unwrap_attributes(node)
+    reference = _object_reference(node, object_names)
+    if reference is None:
+        return None
+    return reference + attributes
+
+
+def find_references(
+    environment: Environment, source: str, object_names: set[str]
+) -> set[T_Path]:
+    """Paths of properties referenced at their current iteration by an expression
+
+    Args:
+        environment: Environment parsing the expression
+        source: Source of the expression
+        object_names: Names of the objects expressions can reference
+    """
+    references = set()
+
+    def _visit(node: nodes.Node):
+        path = _attribute_path(node, object_names)
+        if path is not None:
+            references.add(path)
+            return
+        for child in node.iter_child_nodes():
+            _visit(child)
+
+    _visit(Parser(environment, source, state='variable').parse_expression())
+    return references
+
+
+def _history_depth(node: nodes.Call) -> int | None:
+    """Iterations ago referenced by an object call, `None` when not constant"""
+    if node.kwargs or node.dyn_args or node.dyn_kwargs or len(node.args) > 1:
+        return None
+    if not node.args:
+        return 0
+    arg = node.args[0]
+    if isinstance(arg, nodes.Const) and isinstance(arg.value, int):
+        return max(arg.value, 0)
+    return None
+
+
+def _union(first: frozenset | None, second: frozenset | None) -> frozenset | None:
+    return None if first is None or second is None else first | second
+
+
+def merge_history(
+    first: HistoryProjection, second: HistoryProjection
+) -> HistoryProjection:
+    """Projection keeping the parts of previous values of both projections"""
+    return HistoryProjection(
+        None
+        if first.depth is None or second.depth is None
+        else max(first.depth, second.depth),
+        _union(first.fields, second.fields),
+        _union(first.series, second.series),
+    )
+
+
+def find_history(
+    environment: Environment, source: str, object_names: set[str]
+) -> dict[str, HistoryProjection]:
+    """Parts of the previous values of objects referenced by an expression
+
+    `obj(2).field` references `field` of the last 2 values, `obj.field` and
+    `obj().field | series(n)` the aggregates of `field`, series being referenced by
+    their path in the object (ie. `('nested', 'level')`). Objects referenced in
+    any other way (ie. `obj(n)` without attributes) keep their whole values.
+
+    Args:
+        environment: Environment parsing the expression
+        source: Source of the expression
+        object_names: Names of the objects expressions can reference
+    """
+    projections: dict[str, HistoryProjection] = {}
+
+    def _add(object_name: str, projection: HistoryProjection):
+        projections[object_name] = merge_history(
+            projections.get(object_name, NO_HISTORY), projection
+        )
+
+    def _visit(node: nodes.Node):
+        if isinstance(node, nodes.Filter) and node.name == 'series' and node.node:
+            path = _attribute_path(node.node, object_names)
+            if path is not None:
+                field = path[1:] or (DEFAULT_FIELD,)
+                _add(path[0], HistoryProjection(0, frozenset(), frozenset([field])))
+            elif not isinstance(node.node, nodes.Getattr):
+                for object_name in object_names:
+                    _add(object_name, HistoryProjection(0, frozenset(), None))
+        base, attributes = _unwrap_attributes(node)
+        if isinstance(base, nodes.Name) and base.name in object_names:
+            if attributes:
+                series = frozenset([attributes[:1]])
+                _add(base.name, HistoryProjection(0, frozenset(), series))
+            else:
+                _add(base.name, FULL_HISTORY)
+            return
+        if (
+            isinstance(base, nodes.Call)
+            and isinstance(base.node, nodes.Name)
+            and base.node.name in object_names
+        ):
+            depth = _history_depth(base)
+            if depth != 0:
+                fields = frozenset(attributes[:1]) if attributes else None
+                _add(base.node.name, HistoryProjection(depth, fields, frozenset()))
+            for child in base.iter_child_nodes():
+                if child is not base.node:
+                    _visit(child)
+            return
+        for child in node.iter_child_nodes():
+            _visit(child)
+
+    _visit(Parser(environment, source, state='variable').parse_expression())
+    return projections
+
+
+def _children(generator: PropertyGenerator) -> dict[str, PropertyGenerator]:
+    children = {}
+    if isinstance(generator.properties, dict):
+        children |= {
+            key: prop
+            for key, prop in generator.properties.items()
+            if isinstance(prop, PropertyGenerator)
+        }
+    sub_type = getattr(generator.kwargs, 'sub_type', None)
+    if isinstance(sub_type, PropertyGenerator):
+        children['[]'] = sub_type
+    for idx, item in enumerate(generator.items or []):
+        if isinstance(item, PropertyGenerator):
+            children[f'[{idx}]'] = item
+    return children
+
+
+def object_history(
+    environment: Environment, generators: dict[str, PropertyGenerator]
+) -> dict[str, dict[str, HistoryProjection]]:
+    """Parts of the previous values of objects referenced by the expressions of
+    each object, by the name of the referenced object"""
+    object_names = set(generators)
+    references = {object_name: {} for object_name in generators}
+
+    def _walk(object_name: str, generator: PropertyGenerator):
+        expression = generator.config.expression
+        if expression and isinstance(expression, str):
+            found = find_history(environment, expression, object_names)
+            for ref_name, projection in found.items():
+                references[object_name][ref_name] = merge_history(
+                    references[object_name].get(ref_name, NO_HISTORY), projection
+                )
+        for child in _children(generator).values():
+            _walk(object_name, child)
+
+    for object_name, generator in generators.items():
+        _walk(object_name, generator)
+    return references
+
+
+def history_projections(
+    environment: Environment, generators: dict[str, PropertyGenerator]
+) -> dict[str, HistoryProjection]:
+    """Parts of the previous values of each object referenced by the expressions
+    of all objects, unreferenced objects keep no previous values"""
+    projections = {object_name: NO_HISTORY for object_name in generators}
+    for references in object_history(environment, generators).values():
+        for object_name, projection in references.items():
+            projections[object_name] = merge_history(
+                projections[object_name], projection
+            )
+    return projections
+
+
+def history_objects(
+    environment: Environment, generators: dict[str, PropertyGenerator]
+) -> set[str]:
+    """Names of objects whose previous values are referenced, and of the objects
+    referencing them"""
+    names = set()
+    for object_name, references in object_history(environment, generators).items():
+        referenced = {
+            ref_name
+            for ref_name, projection in references.items()
+            if projection != NO_HISTORY
+        }
+        if referenced:
+            names |= referenced | {object_name}
+    return names
+
+
+def property_tree(
+    generators: dict[str, PropertyGenerator],
+) -> dict[T_Path, PropertyGenerator]:
+    """Generators of all objects and their properties by their path"""
+    tree: dict[T_Path, PropertyGenerator] = {}
+
+    def _walk(path: T_Path, generator: PropertyGenerator):
+        tree[path] = generator
+        for key, child in _children(generator).items():
+            _walk(path + (key,), child)
+
+    for object_name, generator in generators.items():
+        _walk((object_name,), generator)
+    return tree
+
+
+def _resolve_path(tree: dict[T_Path, PropertyGenerator], path: T_Path) -> T_Path:
+    """Closest property of a path, referencing the property containing any
+    attribute/item of a rendered value (ie. a key of a generated `dict`)"""
+    while path not in tree:
+        path = path[:-1]
+    return path
+
+
+def build_graph(
+    environment: Environment, generators: dict[str, PropertyGenerator]
+) -> dict[T_Path, set[T_Path]]:
+    """Builds the graph of properties and the properties they depend on
+
+    Dependencies between properties of different branches are also added between
+    the siblings containing them, so siblings can be ordered on their own.
+    """
+    tree = property_tree(generators)
+    graph: dict[T_Path, set[T_Path]] = {path: set() for path in tree}
+    for path in tree:
+        if len(path) > 1:
+            graph[path[:-1]].add(path)
+
+    object_names = set(generators)
+    for path, generator in tree.items():
+        expression = generator.config.expression
+        if not (expression and isinstance(expression, str)):
+            continue
+        for reference in find_references(environment, expression, object_names):
+            if reference[0] not in object_names or (
+                len(reference) > 1 and reference[:2] not in tree
+            ):
+                # Missing properties are reported when rendered
+                continue
+            target = _resolve_path(tree, reference)
+            graph[path].add(target)
+            depth = 0
+            while path[: depth + 1] == target[: depth + 1]:
+                depth += 1
+            # Siblings are only ordered within an object, objects keep their order
+            if 1 <= depth < len(path) and depth < len(target):
+                graph[path[: depth + 1]].add(target[: depth + 1])
+    return graph
+
+
+def resolve(environment: Environment, generators: dict[str, PropertyGenerator]):
+    """Validates references between properties and sets the order properties of
+    objects are rendered in
+
+    Raises:
+        ValueError: Properties reference each other in a cycle
+    """
+    graph = build_graph(environment, generators)
+    sorter = TopologicalSorter(graph)
+    try:
+        order = list(sorter.static_order())
+    except CycleError as e:
+        cycle = ' -> '.join('.'.join(path) for path in e.args[1])
+        raise ValueError(
+            f'Properties reference each other in a cycle: {cycle}'
+        ) from None
+    position = {path: idx for idx, path in enumerate(order)}
+
+    def _order(path: T_Path, generator: PropertyGenerator):
+        if hasattr(generator, 'render_order'):
+            generator.render_order = sorted(
+                generator.properties, key=lambda key: position[path + (key,)]
+            )
+        for key, child in _children(generator).items():
+            _order(path + (key,), child)
+
+    for object_name, generator in generators.items():
+        _order((object_name,), generator)
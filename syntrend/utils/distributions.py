@@ -1,23 +1,27 @@
 from syntrend.config import model
 
-from random import randint, normalvariate
+import random
 
 
-def dist_no_dist(_):
+def dist_no_dist(*_):
     def _generate(input_value):
         return input_value
 
     return _generate
 
 
-def dist_linear(prop_dist: model.PropertyDistribution):
+def dist_linear(prop_dist: model.PropertyDistribution, random_stream=random):
     def _generator(input_value):
-        return input_value + randint(prop_dist.min_offset, prop_dist.max_offset)
+        return input_value + random_stream.randint(
+            prop_dist.min_offset, prop_dist.max_offset
+        )
 
     return _generator
 
 
-def dist_standard_deviation(prop_dist: model.PropertyDistribution):
+def dist_standard_deviation(
+    prop_dist: model.PropertyDistribution, random_stream=random
+):
     # if prop_dist.min_offset >= prop_dist.max_offset:
     #     raise ValueError("min_offset must be less than max_offset")
     # scale = prop_dist.max_offset - prop_dist.min_offset
@@ -32,7 +36,50 @@ def dist_standard_deviation(prop_dist: model.PropertyDistribution):
     #     raise ValueError("Cannot create value in Std Dev with given numbers", alpha, beta)
 
     def _generator(input_value):
-        return normalvariate(input_value, float(prop_dist.std_dev_factor))
+        return random_stream.normalvariate(input_value, float(prop_dist.std_dev_factor))
+
+    return _generator
+
+
+def batch_dist_no_dist(*_):
+    def _generate(input_values):
+        return input_values
+
+    return _generate
+
+
+def batch_dist_linear(
+    prop_dist: model.PropertyDistribution, numpy_random=None, random_stream=random
+):
+    if numpy_random is None:
+        return _batch_python(dist_linear(prop_dist, random_stream))
+
+    def _generator(input_values):
+        return input_values + numpy_random.integers(
+            prop_dist.min_offset,
+            prop_dist.max_offset,
+            size=len(input_values),
+            endpoint=True,
+        )
+
+    return _generator
+
+
+def batch_dist_standard_deviation(
+    prop_dist: model.PropertyDistribution, numpy_random=None, random_stream=random
+):
+    if numpy_random is None:
+        return _batch_python(dist_standard_deviation(prop_dist, random_stream))
+
+    def _generator(input_values):
+        return numpy_random.normal(input_values, float(prop_dist.std_dev_factor))
+
+    return _generator
+
+
+def _batch_python(dist_func):
+    def _generator(input_values):
+        return [dist_func(input_value) for input_value in input_values]
 
     return _generator
 
@@ -42,7 +89,27 @@ DISTRIBUTIONS = {
     model.DistributionTypes.Linear: dist_linear,
     model.DistributionTypes.StdDev: dist_standard_deviation,
 }
+BATCH_DISTRIBUTIONS = {
+    model.DistributionTypes.NoDistribution: batch_dist_no_dist,
+    model.DistributionTypes.Linear: batch_dist_linear,
+    model.DistributionTypes.StdDev: batch_dist_standard_deviation,
+}
+
+
+def get_distribution(prop_def: model.PropertyDistribution, random_stream=random):
+    return DISTRIBUTIONS[prop_def.type](prop_def, random_stream)
+
 
+def get_batch_distribution(
+    prop_def: model.PropertyDistribution, numpy_random=None, random_stream=random
+):
+    """Loads a distribution applied to a whole batch of values at once.
 
-def get_distribution(prop_def: model.PropertyDistribution):
-    return DISTRIBUTIONS[prop_def.type](prop_def)
+    Args:
+        prop_def: Distribution configuration of the property
+        numpy_random: NumPy `Generator` to apply the distribution to arrays with.
+            Values are distributed one at a time when not provided.
+        random_stream: `random.Random` instance values are distributed with when
+            not using NumPy. Defaults to the shared `random` module.
+    """
+    return BATCH_DISTRIBUTIONS[prop_def.type](prop_def, numpy_random, random_stream)
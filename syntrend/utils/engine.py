@@ -0,0 +1,46 @@
+"""Selection of the engine used to draw numeric values in bulk.
+
+The `numpy` engine draws whole arrays of values from a NumPy `Generator` when NumPy
+is installed. Without NumPy, or with the default `python` engine, values are drawn
+through the `random` module.
+"""
+
+from functools import cache
+import logging
+
+LOG = logging.getLogger(__name__)
+ENGINE_PYTHON = 'python'
+ENGINE_NUMPY = 'numpy'
+ENGINES = (ENGINE_PYTHON, ENGINE_NUMPY)
+
+
+@cache
+def load_numpy():
+    """NumPy module, `None` when not installed (warning once)"""
+    try:
+        import numpy
+    except ImportError:
+        LOG.warning("NumPy is not installed, falling back to the 'python' engine")
+        return None
+    return numpy
+
+
+def numpy_random(seed: int = None):
+    """Creates a NumPy random `Generator` if the NumPy engine is selected
+
+    Args:
+        seed: Seed of the new `Generator`, drawn from OS entropy when not provided
+
+    Returns:
+        `numpy.random.Generator` instance, or None when the `python` engine is
+        selected or NumPy is not installed
+    """
+    # Imported here as the config model validates engines against `ENGINES`
+    from syntrend.config import CONFIG
+
+    if CONFIG.config.engine != ENGINE_NUMPY:
+        return None
+    numpy = load_numpy()
+    if numpy is None:
+        return None
+    return numpy.random.default_rng(seed)
@@ -0,0 +1,335 @@
+"""Compilation of property expressions shared across generators.
+
+Expressions are parsed on their own (as `Environment.compile_expression` does) and
+compiled to a template assigning their value to `result`. The environment's cache
+keeps each distinct expression compiled once by its source text (evicting the
+least recently used past `expression_cache_size`), and the optional bytecode cache
+in `expression_cache_dir` keeps compiled expressions between runs.
+
+The `native` backend translates the parsed expression to a Python lambda instead,
+calling straight into the environment's attribute lookups, filters and tests.
+Expressions using syntax it doesn't translate are compiled by Jinja.
+"""
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    TemplateSyntaxError,
+    nodes,
+    pass_context,
+)
+from jinja2.parser import Parser
+
+from pathlib import Path
+from typing import Callable
+import ast
+import logging
+
+LOG = logging.getLogger(__name__)
+BACKEND_JINJA = 'jinja'
+BACKEND_NATIVE = 'native'
+BACKENDS = (BACKEND_JINJA, BACKEND_NATIVE)
+NAME_PREFIX = 'n_'
+BIN_OPERATORS = {
+    '+': ast.Add,
+    '-': ast.Sub,
+    '*': ast.Mult,
+    '/': ast.Div,
+    '//': ast.FloorDiv,
+    '%': ast.Mod,
+    '**': ast.Pow,
+}
+UNARY_OPERATORS = {'-': ast.USub, '+': ast.UAdd, 'not': ast.Not}
+# Marker set by `pass_context` on filters and tests taking the template context
+PASS_CONTEXT = pass_context(lambda: None).jinja_pass_arg
+COMPARE_OPERATORS = {
+    'eq': ast.Eq,
+    'ne': ast.NotEq,
+    'gt': ast.Gt,
+    'gteq': ast.GtE,
+    'lt': ast.Lt,
+    'lteq': ast.LtE,
+    'in': ast.In,
+    'notin': ast.NotIn,
+}
+
+
+def create_environment(cache_size: int, cache_dir: Path | str = '') -> Environment:
+    """Creates the environment compiling expressions
+
+    Args:
+        cache_size: Number of compiled expressions kept in memory
+        cache_dir: Directory of the on-disk bytecode cache, no cache when empty
+    """
+    return Environment(
+        cache_size=cache_size,
+        bytecode_cache=FileSystemBytecodeCache(str(cache_dir)) if cache_dir else None,
+        auto_reload=False,
+    )
+
+
+def parse_expression(environment: Environment, source: str) -> nodes.Expr:
+    """Parses an expression, rejecting any tokens following it"""
+    parser = Parser(environment, source, state='variable')
+    expression = parser.parse_expression()
+    if not parser.stream.eos:
+        raise TemplateSyntaxError(
+            'chunk after expression', parser.stream.current.lineno, None, None
+        )
+    expression.set_environment(environment)
+    return expression
+
+
+def _compile_template(environment: Environment, source: str):
+    body = [
+        nodes.Assign(
+            nodes.Name('result', 'store'),
+            parse_expression(environment, source),
+            lineno=1,
+        )
+    ]
+    bytecode_cache = environment.bytecode_cache
+    bucket = None
+    if bytecode_cache is not None:
+        bucket = bytecode_cache.get_bucket(environment, source, None, source)
+    code = bucket.code if bucket is not None else None
+    if code is None:
+        code = environment.compile(nodes.Template(body, lineno=1), source)
+        if bucket is not None:
+            bucket.code = code
+            bytecode_cache.set_bucket(bucket)
+    return environment.template_class.from_code(
+        environment, code, environment.make_globals(None)
+    )
+
+
+def compile_expression(environment: Environment, source: str) -> Callable:
+    """Compiles an expression, reusing the function of identical expressions
+
+    Returns:
+        Function evaluating the expression with its variables passed as keyword
+        arguments
+    """
+    cache = environment.cache
+    if cache is not None and source in cache:
+        return cache[source]
+    template = _compile_template(environment, source)
+
+    def _expression(**context):
+        return template.make_module(context).result
+
+    if cache is not None:
+        cache[source] = _expression
+    return _expression
+
+
+def _passes_context(func) -> bool:
+    return getattr(func, 'jinja_pass_arg', None) is PASS_CONTEXT
+
+
+class UnsupportedExpression(Exception):
+    """Expression uses syntax without a native translation"""
+
+
+class NativeTranslator:
+    """Translates a Jinja expression node tree to a Python expression tree.
+
+    Names are collected in `names` and become arguments of the compiled lambda,
+    helpers of the environment are referenced as globals (see `compile_native`).
+    """
+
+    def __init__(self, environment: Environment):
+        self.environment = environment
+        self.names: list[str] = []
+
+    def visit(self, node: nodes.Node) -> ast.expr:
+        visitor = getattr(self, f'visit_{type(node).__name__}', None)
+        if visitor is None:
+            raise UnsupportedExpression(type(node).__name__)
+        return visitor(node)
+
+    def _helper(self, name: str, *args: ast.expr) -> ast.Call:
+        return ast.Call(func=ast.Name(name, ast.Load()), args=list(args), keywords=[])
+
+    def _call_args(self, node) -> tuple[list[ast.expr], list[ast.keyword]]:
+        if node.dyn_args is not None or node.dyn_kwargs is not None:
+            raise UnsupportedExpression('Dynamic Arguments')
+        return [self.visit(arg) for arg in node.args], [
+            ast.keyword(kwarg.key, self.visit(kwarg.value)) for kwarg in node.kwargs
+        ]
+
+    def _filter_args(self, node) -> list[ast.expr]:
+        args, kwargs = self._call_args(node)
+        return [
+            ast.Constant(node.name),
+            self.visit(node.node),
+            ast.List(args, ast.Load()),
+            ast.Dict(
+                [ast.Constant(kw.arg) for kw in kwargs], [kw.value for kw in kwargs]
+            ),
+        ]
+
+    def visit_Const(self, node: nodes.Const) -> ast.expr:
+        if not isinstance(node.value, (str, int, float, bool, type(None))):
+            raise UnsupportedExpression(type(node.value).__name__)
+        return ast.Constant(node.value)
+
+    def visit_Name(self, node: nodes.Name) -> ast.expr:
+        if node.name not in self.names:
+            self.names.append(node.name)
+        return ast.Name(NAME_PREFIX + node.name, ast.Load())
+
+    def visit_Tuple(self, node: nodes.Tuple) -> ast.expr:
+        return ast.Tuple([self.visit(item) for item in node.items], ast.Load())
+
+    def visit_List(self, node: nodes.List) -> ast.expr:
+        return ast.List([self.visit(item) for item in node.items], ast.Load())
+
+    def visit_Dict(self, node: nodes.Dict) -> ast.expr:
+        return ast.Dict(
+            [self.visit(pair.key) for pair in node.items],
+            [self.visit(pair.value) for pair in node.items],
+        )
+
+    def visit_BinExpr(self, node: nodes.BinExpr) -> ast.expr:
+        if node.operator in ('and', 'or'):
+            return ast.BoolOp(
+                ast.And() if node.operator == 'and' else ast.Or(),
+                [self.visit(node.left), self.visit(node.right)],
+            )
+        return ast.BinOp(
+            self.visit(node.left),
+            BIN_OPERATORS[node.operator](),
+            self.visit(node.right),
+        )
+
+    visit_Add = visit_Sub = visit_Mul = visit_Div = visit_BinExpr
+    visit_FloorDiv = visit_Mod = visit_Pow = visit_And = visit_Or = visit_BinExpr
+
+    def visit_UnaryExpr(self, node: nodes.UnaryExpr) -> ast.expr:
+        return ast.UnaryOp(UNARY_OPERATORS[node.operator](), self.visit(node.node))
+
+    visit_Neg = visit_Pos = visit_Not = visit_UnaryExpr
+
+    def visit_Concat(self, node: nodes.Concat) -> ast.expr:
+        return self._helper('_concat', *[self.visit(item) for item in node.nodes])
+
+    def visit_Compare(self, node: nodes.Compare) -> ast.expr:
+        return ast.Compare(
+            self.visit(node.expr),
+            [COMPARE_OPERATORS[operand.op]() for operand in node.ops],
+            [self.visit(operand.expr) for operand in node.ops],
+        )
+
+    def visit_CondExpr(self, node: nodes.CondExpr) -> ast.expr:
+        return ast.IfExp(
+            self.visit(node.test),
+            self.visit(node.expr1),
+            self._helper('_undefined')
+            if node.expr2 is None
+            else self.visit(node.expr2),
+        )
+
+    def visit_Getattr(self, node: nodes.Getattr) -> ast.expr:
+        return self._helper('_getattr', self.visit(node.node), ast.Constant(node.attr))
+
+    def visit_Getitem(self, node: nodes.Getitem) -> ast.expr:
+        return self._helper('_getitem', self.visit(node.node), self.visit(node.arg))
+
+    def visit_Slice(self, node: nodes.Slice) -> ast.expr:
+        return self._helper(
+            'slice',
+            *[
+                ast.Constant(None) if part is None else self.visit(part)
+                for part in (node.start, node.stop, node.step)
+            ],
+        )
+
+    def visit_Call(self, node: nodes.Call) -> ast.expr:
+        args, kwargs = self._call_args(node)
+        return ast.Call(self.visit(node.node), args, kwargs)
+
+    def visit_Filter(self, node: nodes.Filter) -> ast.expr:
+        func = self.environment.filters.get(node.name)
+        if node.node is None or _passes_context(func):
+            raise UnsupportedExpression(f'Filter {node.name}')
+        return self._helper('_filter', *self._filter_args(node))
+
+    def visit_Test(self, node: nodes.Test) -> ast.expr:
+        func = self.environment.tests.get(node.name)
+        if _passes_context(func):
+            raise UnsupportedExpression(f'Test {node.name}')
+        return self._helper('_test', *self._filter_args(node))
+
+
+def _concat(*values) -> str:
+    return ''.join(str(value) for value in values)
+
+
+def compile_native(environment: Environment, source: str) -> Callable | None:
+    """Compiles an expression to a Python function, reusing the function of
+    identical expressions
+
+    Returns:
+        Function evaluating the expression with its variables passed as keyword
+        arguments, or `None` when the expression uses unsupported syntax
+    """
+    cache = environment.cache
+    # Shares the cache of `compile_expression`, keyed apart by the backend
+    key = (BACKEND_NATIVE, source)
+    if cache is not None and key in cache:
+        return cache[key]
+    function = _compile_native(environment, source)
+    if cache is not None:
+        cache[key] = function
+    return function
+
+
+def _compile_native(environment: Environment, source: str) -> Callable | None:
+    expression = parse_expression(environment, source)
+    translator = NativeTranslator(environment)
+    try:
+        body = translator.visit(expression)
+    except UnsupportedExpression as e:
+        LOG.debug('Expression "%s" is compiled by Jinja (%s)', source, e)
+        return None
+    names = translator.names
+    tree = ast.Expression(
+        ast.Lambda(
+            ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(NAME_PREFIX + name) for name in names],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            body,
+        )
+    )
+    function = eval(
+        compile(ast.fix_missing_locations(tree), f'<expression {source}>', 'eval'),
+        {
+            '__builtins__': {},
+            'slice': slice,
+            '_concat': _concat,
+            '_undefined': environment.undefined,
+            '_getattr': environment.getattr,
+            '_getitem': environment.getitem,
+            '_filter': environment.call_filter,
+            '_test': environment.call_test,
+        },
+    )
+    env_globals = environment.globals
+    undefined = environment.undefined
+
+    def _resolve(name: str):
+        if name in env_globals:
+            return env_globals[name]
+        return undefined(name=name)
+
+    def _expression(**context):
+        return function(
+            *[context[name] if name in context else _resolve(name) for name in names]
+        )
+
+    return _expression
@@ -1,5 +1,7 @@
+from syntrend.utils import dependencies
+from syntrend.utils.historian import DEFAULT_FIELD, NumericSeries
+
 import datetime
-import random
 import re
 import logging
 from typing import Union, TYPE_CHECKING
@@ -16,6 +18,8 @@ R_DELTA = re.compile(r'(\d+)([dHMS])')
 DELTA_ABBR_MAP = {'d': 'days', 'H': 'hours', 'M': 'minutes', 'S': 'seconds'}
 
 MANAGER: Union['SeriesManager', None] = None
+SERIES_PATHS: dict[int, tuple[str, ...]] = {}
+"""Path of the series of each property generator in its object's values"""
 
 
 def to_timestamp(value: datetime.datetime):
@@ -43,30 +47,56 @@ def to_datetime(value_string):
     return datetime.timedelta(**time_parts)
 
 
-def series(generator, series_length):
+def _get_series(value) -> NumericSeries | None:
+    if isinstance(value, NumericSeries):
+        return value
+    path = SERIES_PATHS.get(id(value))
+    if path is None:
+        return None
+    return MANAGER.historians[value.root_object].get_series(path)
+
+
+def series(value, series_length):
+    """Compares all previous values of a numeric field with a value
+
+    Comparisons over the whole window (see `config.historian_window`) use the
+    rolling `min`/`max` of the field, shorter series scan their values.
+
+    Args:
+        value: Property (ie. `this().nested.sensor`) or its series (`this.sensor`)
+        series_length: Number of previous values compared
+    """
+    window = _get_series(value)
+    values = [] if window is None else window.latest(series_length)
+
     class _Comparator:
         def __init__(self):
-            self._v = [
-                generator.condition_historian(i) for i in range(0, -series_length, -1)
-            ]
+            self._v = values
+            self._min = self._max = None
+            if not values:
+                return
+            if series_length >= window.count:
+                self._min, self._max = window.min, window.max
+            else:
+                self._min, self._max = min(values), max(values)
 
         def __eq__(self, other):
-            return all([a == other for a in self._v])
+            return bool(self._v) and self._min == other == self._max
 
         def __ne__(self, other):
-            return all([a != other for a in self._v])
+            return bool(self._v) and other not in self._v
 
         def __gt__(self, other):
-            return all([a > other for a in self._v])
+            return bool(self._v) and self._min > other
 
         def __ge__(self, other):
-            return all([a >= other for a in self._v])
+            return bool(self._v) and self._min >= other
 
         def __lt__(self, other):
-            return all([a < other for a in self._v])
+            return bool(self._v) and self._max < other
 
         def __le__(self, other):
-            return all([a <= other for a in self._v])
+            return bool(self._v) and self._max <= other
 
         def __contains__(self, item):
             return item in self._v
@@ -74,18 +104,37 @@ def series(generator, series_length):
     return _Comparator()
 
 
-def get_object(object_name):
-    historian = MANAGER.historians[object_name]
-    generator = MANAGER.generators[object_name]
+class ObjectReference:
+    """Accessor of an object in expressions
+
+    `obj()` references the current iteration of an object, `obj(n)` the value of
+    `n` iterations ago and `obj.field` the rolling window of a numeric field (ie.
+    `obj.sensor.mean`, see `historian.NumericSeries`).
+    """
+
+    # Private names keep the fields of objects (ie. `obj.generator`) resolvable
+    __slots__ = ('_generator', '_historian')
+
+    def __init__(self, object_name: str):
+        self._generator = MANAGER.generators[object_name]
+        self._historian = MANAGER.historians[object_name]
 
-    def get_index(index: int = 0):
+    def __call__(self, index: int = 0):
         if index == 0:
-            return generator
-        if index <= len(historian):
-            return historian[index - 1]
+            return self._generator
+        if index <= len(self._historian):
+            return self._historian[index - 1]
         return None
 
-    return get_index
+    def __getattr__(self, field: str) -> NumericSeries:
+        window = self._historian.get_series((field,))
+        if window is None:
+            raise AttributeError(f"Object has no numeric field '{field}'")
+        return window
+
+
+def get_object(object_name):
+    return ObjectReference(object_name)
 
 
 def load_environment(manager: 'SeriesManager'):
@@ -99,7 +148,7 @@ def load_environment(manager: 'SeriesManager'):
         sin=math.sin,
         cos=math.cos,
         tan=math.tan,
-        random=random.randint,
+        random=manager.random_stream('expressions').randint,
     )
     manager.expression_env.filters.update(
         to_timestamp=to_timestamp,
@@ -109,3 +158,6 @@ def load_environment(manager: 'SeriesManager'):
     )
     for object_name in manager.historians:
         manager.expression_env.globals[object_name] = get_object(object_name)
+    SERIES_PATHS.clear()
+    for path, generator in dependencies.property_tree(manager.generators).items():
+        SERIES_PATHS[id(generator)] = path[1:] or (DEFAULT_FIELD,)
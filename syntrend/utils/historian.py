@@ -1,17 +1,171 @@
 from syntrend.config import CONFIG
-from collections import deque
+from array import array
+from collections import deque, namedtuple
+import math
 import re
 
 RE_PATH_ROOT = re.compile(r'^(?:\[(-?\d*)])?\.?(.*)$')
+DEFAULT_FIELD = 'value'
+HistoryProjection = namedtuple('HistoryProjection', 'depth,fields,series')
+"""Parts of the previous values of an object referenced by expressions
+
+`depth` is the number of previous values kept, `fields` the top-level fields kept
+of each value and `series` the paths of the numeric fields aggregated (ie.
+`('nested', 'level')`). `None` references all of them (see
+`utils.dependencies.find_history`).
+"""
+FULL_HISTORY = HistoryProjection(None, None, None)
+NO_HISTORY = HistoryProjection(0, frozenset(), frozenset())
+
+
+def _field_value(value, path: tuple[str, ...]):
+    """Value at the path of nested fields, `None` when missing"""
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _fields(value: dict, path: tuple[str, ...] = ()):
+    """Paths and values of all nested fields"""
+    for key, item in value.items():
+        if isinstance(item, dict):
+            yield from _fields(item, path + (key,))
+        else:
+            yield path + (key,), item
+
+
+class NumericSeries:
+    """Window of the latest values of a numeric field with rolling aggregates.
+
+    Values are kept in a ring buffer of doubles. `sum` is updated as values enter
+    and leave the window and `min`/`max` are kept in monotonic queues, so every
+    aggregate is maintained in constant (amortized) time per value.
+    """
+
+    __slots__ = ('window', 'values', 'appended', 'total', 'min_queue', 'max_queue')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = array('d', bytes(8 * window))
+        self.appended = 0
+        self.total = 0.0
+        self.min_queue: deque[tuple[int, float]] = deque()
+        self.max_queue: deque[tuple[int, float]] = deque()
+
+    def append(self, value: float) -> None:
+        index = self.appended
+        position = index % self.window
+        if index >= self.window:
+            self.total -= self.values[position]
+        self.values[position] = value
+        self.appended += 1
+        if position == self.window - 1:
+            # Resets the floating point error accumulated by the running sum
+            self.total = math.fsum(self.values)
+        else:
+            self.total += value
+        while self.min_queue and self.min_queue[-1][1] >= value:
+            self.min_queue.pop()
+        self.min_queue.append((index, value))
+        if self.min_queue[0][0] <= index - self.window:
+            self.min_queue.popleft()
+        while self.max_queue and self.max_queue[-1][1] <= value:
+            self.max_queue.pop()
+        self.max_queue.append((index, value))
+        if self.max_queue[0][0] <= index - self.window:
+            self.max_queue.popleft()
+
+    @property
+    def count(self) -> int:
+        return min(self.appended, self.window)
+
+    @property
+    def sum(self) -> float:
+        return self.total
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.appended else None
+
+    @property
+    def min(self) -> float | None:
+        return self.min_queue[0][1] if self.appended else None
+
+    @property
+    def max(self) -> float | None:
+        return self.max_queue[0][1] if self.appended else None
+
+    def latest(self, length: int) -> list[float]:
+        """Latest `length` values of the window, starting with the most recent"""
+        length = min(length, self.count)
+        return [
+            self.values[(self.appended - offset) % self.window]
+            for offset in range(1, length + 1)
+        ]
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f'<NumericSeries count={self.count} mean={self.mean}>'
 
 
 class Historian:
-    def __init__(self):
-        self.__values: deque = deque(maxlen=CONFIG.config.max_historian_buffer)
+    def __init__(self, window: int = 0, projection: HistoryProjection = FULL_HISTORY):
+        """
+        Args:
+            window: Number of values aggregated for each numeric field, defaults to
+                `config.historian_window`
+            projection: Parts of the values kept, all of them by default
+        """
+        depth = CONFIG.config.max_historian_buffer
+        if projection.depth is not None:
+            depth = min(projection.depth, depth)
+        self.__values: deque = deque(maxlen=depth)
+        self.fields = projection.fields
+        self.series_fields = projection.series
+        self.window = window or CONFIG.config.historian_window
+        self.series: dict[tuple[str, ...], NumericSeries] = {}
+
+    @property
+    def tracking(self) -> bool:
+        """Whether appended values are kept, either as values or aggregates"""
+        return bool(self.__values.maxlen) or self.series_fields != frozenset()
 
     # Historian Manager methods
     def append(self, _object):
-        self.__values.appendleft(_object)
+        if self.__values.maxlen:
+            if self.fields is not None and isinstance(_object, dict):
+                self.__values.appendleft(
+                    {field: _object[field] for field in self.fields if field in _object}
+                )
+            else:
+                self.__values.appendleft(_object)
+        if not isinstance(_object, dict):
+            fields = [((DEFAULT_FIELD,), _object)]
+        elif self.series_fields is None:
+            fields = _fields(_object)
+        else:
+            fields = [
+                (path, _field_value(_object, path)) for path in self.series_fields
+            ]
+        for field, value in fields:
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if self.series_fields is not None and field not in self.series_fields:
+                continue
+            if field not in self.series:
+                self.series[field] = NumericSeries(self.window)
+            self.series[field].append(value)
+
+    def get_series(
+        self, path: tuple[str, ...] = (DEFAULT_FIELD,)
+    ) -> NumericSeries | None:
+        """Rolling window of a numeric field by its path in the object's values,
+        `None` when no numbers were appended"""
+        return self.series.get(path)
 
     def has_values(self) -> bool:
         return len(self.__values) > 0
@@ -1,14 +1,22 @@
 from syntrend.config import CONFIG
-from syntrend.generators import get_generator, PropertyGenerator
-from syntrend.utils import historian, filters, exceptions as exc
+from syntrend.generators import get_generator, IterationFrame, PropertyGenerator
+from syntrend.utils import (
+    dependencies,
+    expressions,
+    historian,
+    filters,
+    sharding,
+    exceptions as exc,
+)
+from syntrend.utils.pacing import Pacer
+from syntrend.utils.scheduler import EventScheduler
 from syntrend.formatters import load_formatter
 
-from jinja2 import Environment, BaseLoader, exceptions
+from jinja2 import exceptions
 
 import re
-import time
+import random
 from datetime import datetime
-from typing import Any
 
 RE_EXPR_PATH_FUNC = re.compile(r"path\(['\"](.*?)['\"]\)")
 
@@ -18,17 +26,57 @@ class SeriesManager:
         self.generators = {}
         self.formatters = {}
         self.historians: dict[str, historian.Historian] = {}
-        self.expression_env = Environment(loader=BaseLoader())
-        self.__renderers: dict[str, int] = {}
+        self.__expression_cache_settings = (
+            CONFIG.config.expression_cache_size,
+            CONFIG.config.expression_cache_dir,
+        )
+        self.expression_env = expressions.create_environment(
+            *self.__expression_cache_settings
+        )
+        self.shard = sharding.SINGLE_SHARD
+        self.seed = ''
+        self.shard_seed = ''
+        self.ranges: dict[str, range] = {}
+        self.frames: dict[str, IterationFrame] = {}
         self.__expr_lookups = {}
+        self.__streams: dict[str, int] = {}
 
     def current_iteration(self, object_name: str) -> int:
-        return self.__renderers[object_name]
+        return self.frames[object_name].iteration
+
+    def iteration_frame(self, object_name: str) -> IterationFrame:
+        """Frame caching the values rendered by the generators of an object"""
+        if object_name not in self.frames:
+            self.frames[object_name] = IterationFrame()
+        return self.frames[object_name]
+
+    def random_stream(self, *key: str) -> random.Random:
+        """Creates an independent random stream
+
+        Streams are seeded from `config.seed`, the shard and the key identifying
+        its user (ie. the object and property names), so the same project file
+        renders the same values on every run. Without a seed, streams of shards
+        are seeded from the seed shared by the shards of a run (`shard_seed`), and
+        otherwise from OS entropy.
+
+        Args:
+            *key: Names identifying the user of the stream
+        """
+        name = ':'.join([str(self.shard.index), *key])
+        occurrence = self.__streams.get(name, 0)
+        self.__streams[name] = occurrence + 1
+        seed = self.seed or self.shard_seed
+        if not seed:
+            return random.Random()
+        return random.Random(f'{seed}:{name}:{occurrence}')
 
     def load_expression(self, prop_generator: PropertyGenerator):
-        compiled_expr = self.expression_env.compile_expression(
-            prop_generator.config.expression, undefined_to_none=False
-        )
+        source = prop_generator.config.expression
+        compiled_expr = None
+        if CONFIG.config.expression_backend == expressions.BACKEND_NATIVE:
+            compiled_expr = expressions.compile_native(self.expression_env, source)
+        if compiled_expr is None:
+            compiled_expr = expressions.compile_expression(self.expression_env, source)
 
         def _generate(**kwargs):
             try:
@@ -48,48 +96,102 @@ class SeriesManager:
         return _generate
 
     def load(self):
+        # Streams restart with each load, so the same project renders the same values
+        self.__streams.clear()
+        cache_settings = (
+            CONFIG.config.expression_cache_size,
+            CONFIG.config.expression_cache_dir,
+        )
+        if cache_settings != self.__expression_cache_settings:
+            # Compiled expressions are kept between loads with the same settings
+            self.expression_env = expressions.create_environment(*cache_settings)
+            self.__expression_cache_settings = cache_settings
+        self.seed = CONFIG.config.seed
         for obj_name in CONFIG.objects:
-            self.historians[obj_name] = historian.Historian()
+            self.frames[obj_name] = IterationFrame()
             self.generators[obj_name] = get_generator(
                 obj_name, CONFIG.objects[obj_name], ROOT_MANAGER
             )
-            self.formatters[obj_name] = load_formatter(obj_name)
-            self.__renderers[obj_name] = 0
 
+        dependencies.resolve(self.expression_env, self.generators)
+        # Objects referencing previous values are rendered by a single shard
+        history_objects = dependencies.history_objects(
+            self.expression_env, self.generators
+        )
+        for obj_name in CONFIG.objects:
+            self.ranges[obj_name] = sharding.shard_range(
+                obj_name, self.shard, history_objects
+            )
+            if self.ranges[obj_name]:
+                self.formatters[obj_name] = load_formatter(
+                    obj_name,
+                    sharding.first_sequence(obj_name, self.shard, history_objects),
+                )
+        # Historians only keep the previous values referenced by expressions
+        projections = dependencies.history_projections(
+            self.expression_env, self.generators
+        )
+        for obj_name in CONFIG.objects:
+            self.historians[obj_name] = historian.Historian(
+                projection=projections[obj_name]
+            )
         filters.load_environment(self)
 
     def start(self):
-        next_events: dict[int, list[tuple[str, Any]]] = {}
+        next_events = EventScheduler()
+        historians = {
+            obj_name: history
+            for obj_name, history in self.historians.items()
+            if history.tracking
+        }
 
         def _run(_obj_name: str):
             _value = self.generators[_obj_name].render()
             self.formatters[_obj_name].format(_value)
-            self.historians[_obj_name].append(_value)
+            if _obj_name in historians:
+                historians[_obj_name].append(_value)
+
+        def _run_batch(_obj_name: str):
+            stop = self.ranges[_obj_name].stop
+            history = historians.get(_obj_name)
+            for offset in range(
+                self.ranges[_obj_name].start, stop, CONFIG.config.batch_size
+            ):
+                self.frames[_obj_name].seek(offset)
+                size = min(CONFIG.config.batch_size, stop - offset)
+                for _value in self.generators[_obj_name].render_batch(size):
+                    self.formatters[_obj_name].format(_value)
+                    if history is not None:
+                        history.append(_value)
+                # Keeps the values of the last iteration cached by the batch
+                self.frames[_obj_name].iteration = offset + size - 1
 
         def _get_next_event(_obj_name: str, _current_time: int):
-            if self.__renderers[_obj_name] == CONFIG.objects[_obj_name].output.count:
+            frame = self.frames[_obj_name]
+            if frame.iteration == CONFIG.objects[_obj_name].output.count:
                 return True
             _value = self.generators[_obj_name].render()
             time_value = _value[CONFIG.objects[_obj_name].output.time_field]
             if isinstance(time_value, datetime):
                 time_value = time_value.timestamp()
             if _current_time and time_value <= _current_time:
-                self.generators[_obj_name].undo()
+                frame.rollback()
                 return False
-            if time_value not in next_events:
-                next_events[time_value] = []
-            next_events[time_value].append((_obj_name, _value))
-            self.__renderers[_obj_name] += 1
+            next_events.push(time_value, _obj_name, _value)
+            frame.seek(frame.iteration + 1)
             return True
 
+        active_objects = [
+            obj_name for obj_name in CONFIG.objects if self.ranges[obj_name]
+        ]
         collection_objects = [
             obj_name
-            for obj_name in CONFIG.objects
+            for obj_name in active_objects
             if CONFIG.objects[obj_name].output.collection
         ]
         event_objects = [
             obj_name
-            for obj_name in CONFIG.objects
+            for obj_name in active_objects
             if not CONFIG.objects[obj_name].output.collection
         ]
         time_objects = [
@@ -101,18 +203,14 @@ class SeriesManager:
             obj_name for obj_name in event_objects if obj_name not in time_objects
         ]
 
-        # Render collections for references
-        for obj_name in collection_objects:
-            for iteration in range(CONFIG.objects[obj_name].output.count):
-                self.__renderers[obj_name] = iteration
-                _run(obj_name)
-            self.formatters[obj_name].close()
-
-        # Render events
-        for obj_name in non_time_objects:
-            for iteration in range(CONFIG.objects[obj_name].output.count):
-                self.__renderers[obj_name] = iteration
-                _run(obj_name)
+        # Render collections for references, then events
+        for obj_name in collection_objects + non_time_objects:
+            if self.generators[obj_name].supports_batch():
+                _run_batch(obj_name)
+            else:
+                for iteration in self.ranges[obj_name]:
+                    self.frames[obj_name].seek(iteration)
+                    _run(obj_name)
             self.formatters[obj_name].close()
 
         for obj_name in time_objects:
@@ -120,24 +218,24 @@ class SeriesManager:
 
         if len(next_events) == 0:
             return
-        current_time = min(list(next_events))
-        start = time.time()
+        pacer = Pacer(CONFIG.config.playback_speed)
+        for obj_name in time_objects:
+            if max_rate := CONFIG.objects[obj_name].output.kwargs.get('max_rate'):
+                pacer.set_rate(obj_name, float(max_rate))
         while len(next_events) > 0:
-            new_time = min(list(next_events))
-            if new_time != current_time:
-                time.sleep(new_time - current_time - (time.time() - start))
-            start = time.time()
-            for obj_name, value in next_events.pop(new_time):
-                self.formatters[obj_name].format(value)
-                self.historians[obj_name].append(value)
-                failed_count = 0
-                while _get_next_event(obj_name, new_time) is False:
-                    failed_count += 1
-                    if failed_count == CONFIG.config.max_generator_retries:
-                        raise ValueError(
-                            'Failed to generate an event with a later timestamp'
-                        )
-            current_time = new_time
+            new_time, obj_name, value = next_events.pop()
+            pacer.wait(new_time, obj_name)
+            self.formatters[obj_name].format(value)
+            if obj_name in historians:
+                historians[obj_name].append(value)
+            failed_count = 0
+            while _get_next_event(obj_name, new_time) is False:
+                failed_count += 1
+                if failed_count == CONFIG.config.max_generator_retries:
+                    raise ValueError(
+                        'Failed to generate an event with a later timestamp'
+                    )
+        pacer.report()
 
         # Close Renderers
         for obj_name in time_objects:
@@ -0,0 +1,98 @@
+"""Pacing of time-ordered events against a monotonic clock.
+
+Every event is scheduled relative to an anchor (the first event and the clock time it
+was written at) rather than the previous event, so time spent rendering and writing
+events doesn't accumulate as drift. An optional events/sec ceiling per object spaces
+out the events of that object, and the lag of events written behind their schedule
+is tracked and reported.
+"""
+
+from typing import Callable
+import logging
+import time
+
+LOG = logging.getLogger(__name__)
+LAG_WARNING_SECONDS = 1.0
+
+
+class Pacer:
+    def __init__(
+        self,
+        playback_speed: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            playback_speed: Event time elapsed per second of clock time. `0` writes
+                events without delay (besides any object rate limits).
+            clock: Monotonic clock returning seconds
+            sleep: Function pausing for a number of seconds
+        """
+        self.playback_speed = playback_speed
+        self.clock = clock
+        self.sleep = sleep
+        self.anchor: tuple[float, float] | None = None
+        self.min_intervals: dict[str, float] = {}
+        self.next_allowed: dict[str, float] = {}
+        self.event_count = 0
+        self.total_lag = 0.0
+        self.max_lag: dict[str, float] = {}
+        self.lagging = False
+
+    def set_rate(self, object_name: str, max_rate: float) -> None:
+        """Sets the maximum number of events per second written for an object"""
+        if max_rate <= 0:
+            raise ValueError('Rate limit must be greater than 0 events/sec')
+        self.min_intervals[object_name] = 1 / max_rate
+
+    def wait(self, event_time: float, object_name: str) -> float:
+        """Blocks until an event is due to be written
+
+        Args:
+            event_time: Timestamp of the event
+            object_name: Name of the object the event belongs to
+
+        Returns:
+            Number of seconds the event is behind its schedule
+        """
+        now = self.clock()
+        if self.anchor is None:
+            self.anchor = (event_time, now)
+        target = now
+        if self.playback_speed:
+            target = (
+                self.anchor[1] + (event_time - self.anchor[0]) / self.playback_speed
+            )
+        target = max(target, self.next_allowed.get(object_name, target))
+        if target > now:
+            self.sleep(target - now)
+            now = self.clock()
+        if object_name in self.min_intervals:
+            self.next_allowed[object_name] = (
+                max(now, target) + self.min_intervals[object_name]
+            )
+        lag = max(0.0, now - target)
+        self._record(object_name, lag)
+        return lag
+
+    def _record(self, object_name: str, lag: float) -> None:
+        self.event_count += 1
+        self.total_lag += lag
+        self.max_lag[object_name] = max(self.max_lag.get(object_name, 0.0), lag)
+        if lag >= LAG_WARNING_SECONDS and not self.lagging:
+            LOG.warning('Events are %.3fs behind schedule (at %s)', lag, object_name)
+        elif lag < LAG_WARNING_SECONDS and self.lagging:
+            LOG.info('Events caught up with their schedule')
+        self.lagging = lag >= LAG_WARNING_SECONDS
+
+    def report(self) -> None:
+        if not self.event_count:
+            return
+        LOG.info(
+            'Paced %d events with a mean lag of %.6fs',
+            self.event_count,
+            self.total_lag / self.event_count,
+        )
+        for object_name, max_lag in self.max_lag.items():
+            LOG.info('Max lag of %s: %.6fs', object_name, max_lag)
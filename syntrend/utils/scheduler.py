@@ -0,0 +1,24 @@
+from heapq import heappush, heappop
+from itertools import count
+from typing import Any
+
+
+class EventScheduler:
+    """Priority queue of pending events ordered by their timestamp.
+
+    Events sharing a timestamp are popped in the order they were scheduled.
+    """
+
+    def __init__(self):
+        self.__queue: list[tuple[float, int, str, Any]] = []
+        self.__sequence = count()
+
+    def push(self, timestamp: float, object_name: str, value: Any) -> None:
+        heappush(self.__queue, (timestamp, next(self.__sequence), object_name, value))
+
+    def pop(self) -> tuple[float, str, Any]:
+        timestamp, _, object_name, value = heappop(self.__queue)
+        return timestamp, object_name, value
+
+    def __len__(self):
+        return len(self.__queue)
@@ -0,0 +1,151 @@
+"""Sharded generation of a project across multiple worker processes.
+
+Objects without a cross-record ordering (no `time_field`) have their `output.count`
+split into contiguous shards, one per worker. Each worker renders its own range of
+iterations with independent random streams and writes its own files.
+Console output of each worker is captured and merged in shard order.
+
+Objects which can't be split (time-ordered objects, collections written to the
+console, file outputs without an `{id}` placeholder to tell shards apart, outputs
+written by a sink like `sqlite`, or objects referencing previous values) are
+rendered entirely by the first shard.
+"""
+
+from syntrend.config import CONFIG, load_config
+from syntrend.utils import writers
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Container
+from tempfile import TemporaryDirectory
+import math
+import random
+import shutil
+import sys
+
+Shard = namedtuple('Shard', 'index,total')
+SINGLE_SHARD = Shard(0, 1)
+
+
+def is_shardable(object_name: str, history_objects: Container[str] = ()) -> bool:
+    """Whether the iterations of an object can be split across shards
+
+    Args:
+        object_name: Name of the object
+        history_objects: Objects whose expressions reference previous values, or
+            whose previous values are referenced (see
+            `dependencies.history_objects`), as shards don't share history
+    """
+    output_config = CONFIG.objects[object_name].output
+    if object_name in history_objects:
+        return False
+    if output_config.time_field or output_config.format in writers.SINKS:
+        return False
+    if not writers.is_file_output(object_name):
+        return not output_config.collection
+    _, roll_size = writers.FileHandler.roll_settings(output_config)
+    return '{id}' in output_config.filename_format and not roll_size
+
+
+def _shard_step(object_name: str) -> int:
+    """Shards of file outputs rolling every N events start on a file boundary"""
+    if not writers.is_file_output(object_name):
+        return 1
+    roll_count, _ = writers.FileHandler.roll_settings(
+        CONFIG.objects[object_name].output
+    )
+    return roll_count or 1
+
+
+def shard_range(
+    object_name: str, shard: Shard, history_objects: Container[str] = ()
+) -> range:
+    """Range of iterations of an object rendered by a shard"""
+    count = CONFIG.objects[object_name].output.count
+    if shard.total == 1 or not is_shardable(object_name, history_objects):
+        return range(count) if shard.index == 0 else range(0)
+    step = _shard_step(object_name)
+    chunk = math.ceil(math.ceil(count / shard.total) / step) * step
+    start = min(count, shard.index * chunk)
+    return range(start, min(count, start + chunk))
+
+
+def first_sequence(
+    object_name: str, shard: Shard, history_objects: Container[str] = ()
+) -> int:
+    """Last file `{id}` preceding the first file written by a shard
+
+    Events rolling over every `roll_count` events continue the numbering of a
+    single-process run. Outputs written to a single file get one file per shard.
+    """
+    if shard.total == 1 or not is_shardable(object_name, history_objects):
+        return 0
+    output_config = CONFIG.objects[object_name].output
+    if writers.is_file_output(object_name):
+        roll_count, _ = writers.FileHandler.roll_settings(output_config)
+        if roll_count:
+            return shard_range(object_name, shard, history_objects).start // roll_count
+    return shard.index
+
+
+def _run_shard(
+    project_file: str,
+    shard: Shard,
+    base_seed: int,
+    output_path: str,
+    config_overrides: dict,
+):
+    from syntrend import generators, formatters
+    from syntrend.utils import manager
+
+    with open(output_path, 'w') as console_output:
+        sys.stdout = console_output
+        try:
+            load_config(project_file)
+            for config_key, config_value in config_overrides.items():
+                setattr(CONFIG.config, config_key, config_value)
+            generators.load_generators()
+            formatters.load_formatters()
+            manager.ROOT_MANAGER.shard = shard
+            # Random streams of a shard are derived from `config.seed` when set
+            manager.ROOT_MANAGER.shard_seed = str(base_seed)
+            manager.ROOT_MANAGER.load()
+            manager.ROOT_MANAGER.start()
+        finally:
+            sys.stdout = sys.__stdout__
+
+
+def run(project_file: str, workers: int, config_overrides: dict = None):
+    """Generates a project with a pool of `workers` processes
+
+    Args:
+        project_file: Path of the project file to be loaded by each worker
+        workers: Number of shards/processes to split the generation across
+        config_overrides: Values replacing `config` properties of the project file
+    """
+    base_seed = random.SystemRandom().getrandbits(64)
+    with (
+        TemporaryDirectory(prefix='syntrend_') as temp_dir,
+        ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as pool,
+    ):
+        output_paths = [
+            Path(temp_dir).joinpath(f'shard_{index}') for index in range(workers)
+        ]
+        futures = [
+            pool.submit(
+                _run_shard,
+                str(project_file),
+                Shard(index, workers),
+                base_seed,
+                str(output_paths[index]),
+                config_overrides or {},
+            )
+            for index in range(workers)
+        ]
+        for future in futures:
+            future.result()
+        for output_path in output_paths:
+            with output_path.open('r') as console_output:
+                shutil.copyfileobj(console_output, sys.stdout)
@@ -1,9 +1,19 @@
 from syntrend.config import CONFIG
+from syntrend.generators import GENERATORS
 
 from typing import Any, Callable
 from pathlib import Path
+from datetime import date, time, timedelta
+import bz2
+import gzip
+import json
+import lzma
+import queue
+import sqlite3
 import sys
+import threading
 from os import linesep
+from time import monotonic
 
 T_Event_Callback = Callable[[None], Any]
 BASE_OUTPUT_CONFIG = CONFIG.output
@@ -11,6 +21,28 @@ STREAM_TARGET_FILE = 'stream_file'
 STREAM_TARGET_CONSOLE = 'stream_console'
 CONSOLE_DEFAULT_EVENT_FORMAT = '{body}'
 CONSOLE_DEFAULT_COLLECTION_FORMAT = '{body}'
+DEFAULT_FLUSH_BYTES = 64 * 1024
+FILE_HANDLER_LIMITS = (
+    'flush_bytes',
+    'flush_records',
+    'flush_seconds',
+    'roll_count',
+    'roll_size',
+)
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'bz2': '.bz2', 'lzma': '.xz', 'zstd': '.zst'}
+COMPRESSION_EXTENSIONS = {
+    suffix: compression for compression, suffix in COMPRESSION_SUFFIXES.items()
+} | {'.lzma': 'lzma'}
+DEFAULT_COMPRESSION_LEVELS = {'gzip': 6, 'bz2': 9, 'lzma': 6, 'zstd': 3}
+WRITER_QUEUE_SIZE = 64
+WRITER_FLUSH = object()
+WRITER_CLOSE = object()
+DEFAULT_SQLITE_DATABASE = 'syntrend.db'
+DEFAULT_SQLITE_BATCH_SIZE = 1000
+SQLITE_TYPES = {bool: 'INTEGER', int: 'INTEGER', float: 'REAL', bytes: 'BLOB'}
+DEFAULT_ROW_GROUP_SIZE = 100_000
+COLUMNAR_FORMATS = ('parquet', 'arrow', 'feather')
+SINKS: dict[str, type['OutputHandler']] = {}
 
 
 class OutputHandler:
@@ -22,13 +54,29 @@ class OutputHandler:
     def load(self):
         return
 
-    def write(self, event: str, clear=False) -> None:
+    def write(self, event: str) -> None:
         return
 
     def close(self) -> None:
         return
 
 
+def register_sink(format_name: str):
+    """Registers an Output Handler writing the events of an output format itself
+
+    Sinks are loaded instead of a formatter and receive each event as it was
+    generated (not formatted text) through `write`.
+    """
+    if format_name in SINKS:
+        raise NameError(f'Sink for {format_name} is already registered')
+
+    def _register_sink(handler: type[OutputHandler]):
+        SINKS[format_name] = handler
+        return handler
+
+    return _register_sink
+
+
 class ConsoleHandler(OutputHandler):
     def load(self):
         args = {
@@ -49,39 +97,495 @@ class ConsoleHandler(OutputHandler):
                 'console_event_format', CONSOLE_DEFAULT_EVENT_FORMAT
             )
         self.args['format'] = out_format.format(**args)
+        # Collections are streamed in chunks between the text around their body
+        prefix, _, suffix = self.args['format'].partition('{body}')
+        self.args['prefix'], self.args['suffix'] = prefix.format(), suffix.format()
+        self.args['started'] = False
+
+    def write(self, content: str) -> None:
+        if not self.object_def.output.collection:
+            sys.stdout.write(self.args['format'].format(body=content))
+            return
+        if not self.args['started']:
+            sys.stdout.write(self.args['prefix'])
+            self.args['started'] = True
+        sys.stdout.write(content)
+
+    def close(self) -> None:
+        if self.args['started']:
+            sys.stdout.write(self.args['suffix'])
+
+
+def compression_settings(output_config) -> tuple[str, int]:
+    """Loads the `compression` and `compression_level` options of a file output
+
+    Without a `compression` option, content is compressed after the extension of
+    `filename_format` (ie. `{name}_{id}.json.gz`).
+
+    Returns:
+        Tuple of the compression (empty when uncompressed) and its level
+    """
+    compression = output_config.kwargs.get('compression', '')
+    if not compression:
+        suffix = Path(output_config.filename_format).suffix
+        compression = COMPRESSION_EXTENSIONS.get(suffix, '')
+    if not compression:
+        return '', 0
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"Output 'compression' must be one of {', '.join(COMPRESSION_SUFFIXES)}"
+        )
+    level = int(
+        output_config.kwargs.get(
+            'compression_level', DEFAULT_COMPRESSION_LEVELS[compression]
+        )
+    )
+    return compression, level
+
+
+def open_compressed(raw_file, compression: str, level: int):
+    """Wraps a binary file in a stream compressing the content written to it
+
+    Closing the stream doesn't close `raw_file`.
+    """
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw_file, mode='wb', compresslevel=level)
+    if compression == 'bz2':
+        return bz2.BZ2File(raw_file, mode='wb', compresslevel=level)
+    if compression == 'lzma':
+        return lzma.LZMAFile(raw_file, mode='wb', preset=level)
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "The 'zstd' compression requires zstandard to be installed"
+        ) from None
+    return zstandard.ZstdCompressor(level=level).stream_writer(raw_file, closefd=False)
+
+
+class BackgroundWriter:
+    """Writes to a file from a thread, so compressing content doesn't block
+    generation
+
+    Content is passed to the thread through a queue bounded to
+    `WRITER_QUEUE_SIZE` writes. Errors raised by the thread are raised on the next
+    write, flush or when closing.
+    """
+
+    def __init__(self, handle, name: str):
+        self.handle = handle
+        self.chunks = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+        self.errors = []
+        self.thread = threading.Thread(
+            target=self._run, name=f'syntrend-compression-{name}', daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        while (chunk := self.chunks.get()) is not WRITER_CLOSE:
+            if self.errors:
+                continue
+            try:
+                if chunk is WRITER_FLUSH:
+                    self.handle.flush()
+                else:
+                    self.handle.write(chunk)
+            except Exception as e:
+                self.errors.append(e)
 
-    def write(self, content: str, clear=False) -> None:
-        sys.stdout.write(self.args['format'].format(body=content))
+    def _raise_errors(self):
+        if self.errors:
+            raise self.errors[0]
+
+    def write(self, content: bytes):
+        self._raise_errors()
+        self.chunks.put(content)
+
+    def flush(self):
+        self._raise_errors()
+        self.chunks.put(WRITER_FLUSH)
+
+    def close(self):
+        self.chunks.put(WRITER_CLOSE)
+        self.thread.join()
+        self.handle.close()
+        self._raise_errors()
 
 
 class FileHandler(OutputHandler):
+    """Writes content to files through a persistent, buffered handle.
+
+    Buffered content is flushed once any of the `flush_bytes`, `flush_records` or
+    `flush_seconds` thresholds are met. Files are rolled over to the next `{id}` in
+    the filename format after `roll_count` writes or `roll_size` bytes. Events roll
+    to a new file for every event by default while collections use a single file.
+    Content is compressed when a `compression` is set or implied by the file
+    extension, optionally in a background thread (`compression_thread`).
+    """
+
     def load(self):
+        kwargs = self.object_def.output.kwargs
+        filename_format = self.object_def.output.filename_format
         self.args['sequence'] = 0
         self.args['path'] = Path(self.object_def.output.directory).joinpath(
-            self.object_def.output.filename_format.format(
+            filename_format.format(
                 name=self.object_name,
                 format=self.object_def.output.format,
                 id='{id}',
             )
         )
+        self.args['compression'], self.args['compression_level'] = compression_settings(
+            self.object_def.output
+        )
+        self.args['compression_thread'] = bool(kwargs.get('compression_thread'))
+        suffix = COMPRESSION_SUFFIXES.get(self.args['compression'], '')
+        if suffix and not self.args['path'].name.endswith(suffix):
+            self.args['path'] = self.args['path'].with_name(
+                self.args['path'].name + suffix
+            )
+        self.args['handle'] = None
+        self.args['raw_handle'] = None
+        self.args['flush_bytes'] = int(kwargs.get('flush_bytes', DEFAULT_FLUSH_BYTES))
+        self.args['flush_records'] = int(kwargs.get('flush_records', 0))
+        self.args['flush_seconds'] = float(kwargs.get('flush_seconds', 0))
+        self.args['roll_count'], self.args['roll_size'] = self.roll_settings(
+            self.object_def.output
+        )
+        for arg in FILE_HANDLER_LIMITS:
+            if self.args[arg] < 0:
+                raise ValueError(f"Output '{arg}' must be >= 0")
+
+    @staticmethod
+    def roll_settings(output_config) -> tuple[int, int]:
+        """Loads the `roll_count` and `roll_size` options of an output
+
+        Returns:
+            Tuple of the number of writes and bytes before rolling to a new file
+        """
+        if output_config.collection or '{id}' not in output_config.filename_format:
+            # Nothing to roll over to when the content must stay in one file
+            return 0, 0
+        return (
+            int(output_config.kwargs.get('roll_count', 1)),
+            int(output_config.kwargs.get('roll_size', 0)),
+        )
 
-    def write(self, content: str, clear=False):
+    def _open(self):
         self.args['sequence'] += 1
         file_path = Path(str(self.args['path']).format(id=self.args['sequence']))
-        if clear:
-            file_path.unlink(missing_ok=True)
-        if not file_path.exists():
-            file_path.open(mode='x')
-        with file_path.open(mode='r+b') as f:
-            f.write(content.encode('utf-8'))
+        handle = file_path.open(mode='wb', buffering=self.args['flush_bytes'] or -1)
+        self.args['raw_handle'] = handle
+        if self.args['compression']:
+            handle = open_compressed(
+                handle, self.args['compression'], self.args['compression_level']
+            )
+            if self.args['compression_thread']:
+                handle = BackgroundWriter(handle, self.object_name)
+        self.args['handle'] = handle
+        self.args['file_records'] = 0
+        self.args['file_bytes'] = 0
+        self.args['pending_records'] = 0
+        self.args['last_flush'] = monotonic()
+
+    def _should_roll(self) -> bool:
+        return (
+            0 < self.args['roll_count'] <= self.args['file_records']
+            or 0 < self.args['roll_size'] <= self.args['file_bytes']
+        )
+
+    def _should_flush(self) -> bool:
+        return 0 < self.args['flush_records'] <= self.args['pending_records'] or (
+            self.args['flush_seconds'] > 0
+            and monotonic() - self.args['last_flush'] >= self.args['flush_seconds']
+        )
+
+    def write(self, content: str):
+        if not content:
+            return
+        if self.args['handle'] is not None and self._should_roll():
+            self.close()
+        if self.args['handle'] is None:
+            self._open()
+        handle = self.args['handle']
+        encoded = content.encode('utf-8')
+        handle.write(encoded)
+        self.args['file_records'] += 1
+        self.args['file_bytes'] += len(encoded)
+        self.args['pending_records'] += 1
+        if self._should_flush():
+            handle.flush()
+            self.args['pending_records'] = 0
+            self.args['last_flush'] = monotonic()
+
+    def close(self):
+        if self.args['handle'] is None:
+            return
+        handle, raw_handle = self.args['handle'], self.args['raw_handle']
+        try:
+            handle.close()
+        finally:
+            # Compression and writer errors still release the underlying file
+            self.args['handle'] = None
+            self.args['raw_handle'] = None
+            if raw_handle is not handle:
+                raw_handle.close()
+
+
+def _quote_identifier(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _sqlite_value(value):
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return json.dumps(value, default=str)
 
 
-def setup_event_stream(object_name: str) -> OutputHandler:
+@register_sink('sqlite')
+class SQLiteHandler(OutputHandler):
+    """Inserts events into a table of a SQLite database.
+
+    The table (named after the object unless set by `sqlite_table`) is created
+    from the fields of the first event when it doesn't exist. Rows are inserted
+    `sqlite_batch_size` at a time, each batch in its own transaction. Nested
+    values are stored as JSON text.
+    """
+
+    def load(self):
+        kwargs = self.object_def.output.kwargs
+        database = kwargs.get('sqlite_database')
+        if not database:
+            if not is_file_output(self.object_name):
+                raise ValueError(
+                    "Output 'sqlite_database' is required without an output directory"
+                )
+            database = Path(self.object_def.output.directory).joinpath(
+                DEFAULT_SQLITE_DATABASE
+            )
+        self.args['batch_size'] = int(
+            kwargs.get('sqlite_batch_size', DEFAULT_SQLITE_BATCH_SIZE)
+        )
+        if self.args['batch_size'] < 1:
+            raise ValueError("Output 'sqlite_batch_size' must be >= 1")
+        self.args['table'] = _quote_identifier(
+            str(kwargs.get('sqlite_table', self.object_name))
+        )
+        # Writes are serialized, but may come from the writer thread of `queue_size`
+        self.args['connection'] = sqlite3.connect(database, check_same_thread=False)
+        self.args['fields'] = None
+        self.args['insert'] = ''
+        self.args['rows'] = []
+
+    def _create_table(self, event: dict):
+        self.args['fields'] = list(event)
+        columns = ', '.join(
+            f'{_quote_identifier(field)} {SQLITE_TYPES.get(type(value), "TEXT")}'
+            for field, value in event.items()
+        )
+        table = self.args['table']
+        with self.args['connection'] as connection:
+            connection.execute(f'create table if not exists {table} ({columns})')
+        self.args['insert'] = 'insert into {} ({}) values ({})'.format(
+            table,
+            ', '.join(map(_quote_identifier, self.args['fields'])),
+            ', '.join('?' * len(self.args['fields'])),
+        )
+
+    def _insert_rows(self):
+        with self.args['connection'] as connection:
+            connection.executemany(self.args['insert'], self.args['rows'])
+        self.args['rows'].clear()
+
+    def write(self, event) -> None:
+        if not isinstance(event, dict):
+            event = {'value': event}
+        if self.args['fields'] is None:
+            self._create_table(event)
+        self.args['rows'].append(
+            [_sqlite_value(event.get(field)) for field in self.args['fields']]
+        )
+        if len(self.args['rows']) >= self.args['batch_size']:
+            self._insert_rows()
+
+    def close(self) -> None:
+        if self.args['connection'] is None:
+            return
+        if self.args['rows']:
+            self._insert_rows()
+        self.args['connection'].close()
+        self.args['connection'] = None
+
+
+def column_types(object_name: str) -> dict[str, type | None]:
+    """Python types of the fields of an object's events, from the `type` of their
+    generators or the items of `choice` properties (`None` when values of a
+    generator can be of any type, `object` when they mix types)"""
+    object_def = CONFIG.objects[object_name]
+
+    def _type(prop) -> type | None:
+        if prop.type == 'choice' and prop.items:
+            item_types = {type(item) for item in prop.items if item is not None}
+            if item_types == {int, float}:
+                return float
+            return item_types.pop() if len(item_types) == 1 else object
+        generator = GENERATORS.get(prop.type)
+        return None if generator is None else generator.type
+
+    if object_def.properties:
+        return {key: _type(prop) for key, prop in object_def.properties.items()}
+    return {'value': _type(object_def)}
+
+
+def _text_value(value) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+@register_sink('parquet')
+@register_sink('arrow')
+@register_sink('feather')
+class ColumnarHandler(OutputHandler):
+    """Writes events to a Parquet, Arrow IPC or Feather (LZ4 compressed Arrow IPC)
+    file through `pyarrow`.
+
+    Fields of events are accumulated in column buffers, written as a row group
+    (or record batch) every `row_group_size` events. Columns are typed after the
+    generators of the object's properties, or inferred from the first row group
+    for generators of any type. Columns mixing types (ie. a `choice` of numbers
+    and strings) are stored as strings, JSON encoding values other than strings.
+    """
+
+    def load(self):
+        output = self.object_def.output
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError(
+                f"The '{output.format}' format requires pyarrow to be installed"
+            ) from None
+        if not is_file_output(self.object_name):
+            raise ValueError(f"The '{output.format}' format requires a directory")
+        self.args['pyarrow'] = pyarrow
+        self.args['path'] = Path(output.directory).joinpath(
+            output.filename_format.format(
+                name=self.object_name, format=output.format, id=1
+            )
+        )
+        self.args['row_group_size'] = int(
+            output.kwargs.get('row_group_size', DEFAULT_ROW_GROUP_SIZE)
+        )
+        if self.args['row_group_size'] < 1:
+            raise ValueError("Output 'row_group_size' must be >= 1")
+        self.args['types'] = column_types(self.object_name)
+        self.args['columns'] = None
+        self.args['pending'] = 0
+        self.args['schema'] = None
+        self.args['writer'] = None
+
+    def _arrow_type(self, python_type: type | None):
+        pa = self.args['pyarrow']
+        return {
+            bool: pa.bool_(),
+            int: pa.int64(),
+            float: pa.float64(),
+            str: pa.string(),
+            object: pa.string(),
+        }.get(python_type)
+
+    def _array(self, field: str, values: list, arrow_type):
+        pa = self.args['pyarrow']
+        if self.args['types'].get(field) is object:
+            values = [_text_value(value) for value in values]
+        try:
+            return pa.array(values, type=arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(
+                f"Field '{field}' of '{self.object_name}' mixes types which can't "
+                f'be stored in a column ({e})'
+            ) from None
+
+    def _open(self, arrays: dict):
+        pa = self.args['pyarrow']
+        schema = pa.schema([(field, array.type) for field, array in arrays.items()])
+        output_format = self.object_def.output.format
+        if output_format == 'parquet':
+            import pyarrow.parquet
+
+            writer = pyarrow.parquet.ParquetWriter(str(self.args['path']), schema)
+        else:
+            options = pa.ipc.IpcWriteOptions(
+                compression='lz4' if output_format == 'feather' else None
+            )
+            writer = pa.ipc.new_file(str(self.args['path']), schema, options=options)
+        self.args['schema'] = schema
+        self.args['writer'] = writer
+
+    def _write_row_group(self):
+        pa = self.args['pyarrow']
+        columns = self.args['columns']
+        if self.args['schema'] is None:
+            arrays = {
+                field: self._array(
+                    field, values, self._arrow_type(self.args['types'].get(field))
+                )
+                for field, values in columns.items()
+            }
+            self._open(arrays)
+        else:
+            arrays = {
+                field: self._array(field, values, self.args['schema'].field(field).type)
+                for field, values in columns.items()
+            }
+        self.args['writer'].write_batch(
+            pa.record_batch(list(arrays.values()), schema=self.args['schema'])
+        )
+        for values in columns.values():
+            values.clear()
+        self.args['pending'] = 0
+
+    def write(self, event) -> None:
+        if not isinstance(event, dict):
+            event = {'value': event}
+        columns = self.args['columns']
+        if columns is None:
+            columns = self.args['columns'] = {field: [] for field in event}
+        for field, values in columns.items():
+            values.append(event.get(field))
+        self.args['pending'] += 1
+        if self.args['pending'] >= self.args['row_group_size']:
+            self._write_row_group()
+
+    def close(self) -> None:
+        if self.args['pending']:
+            self._write_row_group()
+        if self.args['writer'] is not None:
+            self.args['writer'].close()
+            self.args['writer'] = None
+
+
+def is_file_output(object_name: str) -> bool:
     output_config = CONFIG.objects[object_name].output
-    if output_config.directory and str(output_config.directory) != '-':
+    return bool(output_config.directory) and str(output_config.directory) != '-'
+
+
+def setup_event_stream(object_name: str, sequence: int = 0) -> OutputHandler:
+    """Loads the Output Handler for an object
+
+    Args:
+        object_name: Name of the object the output belongs to
+        sequence: Last `{id}` used by file outputs, the first file uses `sequence + 1`
+    """
+    if is_file_output(object_name):
         handler = FileHandler(object_name)
     else:
         handler = ConsoleHandler(object_name)
     handler.load()
+    if isinstance(handler, FileHandler):
+        handler.args['sequence'] = sequence
 
     return handler
@@ -72,3 +72,24 @@ def test_project_config_invalid_type():
     assert (
         exc.value.args[0] == 'Value must be parsable to integer'
     ), 'TypeError message should match output from module'
+
+
+@mark.unit
+@mark.parametrize('value,expected', [(0, 0.0), ('2.5', 2.5), (1, 1.0)])
+def test_module_config_playback_speed(value, expected):
+    cfg = model.ModuleConfig(playback_speed=value)
+    assert cfg.playback_speed == expected
+
+
+@mark.unit
+def test_module_config_bad_playback_speed():
+    with raises(ValueError) as exc:
+        model.ModuleConfig(playback_speed=-1)
+    assert exc.value.args[0] == 'Value must be >= 0'
+
+
+@mark.unit
+def test_module_config_bad_expression_backend():
+    with raises(ValueError) as exc:
+        model.ModuleConfig(expression_backend='python')
+    assert exc.value.args[0] == 'Value must be one of jinja, native'
@@ -66,3 +66,37 @@ def test_multiple_objects_as_collection(project, monkeypatch):
     assert (
         len(output) == 5
     ), 'Should generate 4 lines of csv output with header, and an extra empty line'
+
+
+@mark.unit
+def test_stream_collection(project, monkeypatch):
+    project(csv, {'type': 'object', 'output': {'collection': True}})
+    formatter = csv.csv_stream_formatter('test')
+    output = formatter.header()
+    for idx in range(3):
+        output += formatter.rows(Collection(Event({'f1': 'string', 'f2': idx})))
+    output += formatter.footer()
+    assert output.splitlines() == [
+        '"f1","f2"',
+        '"string",0',
+        '"string",1',
+        '"string",2',
+    ], 'Header should only be written once for a streamed collection'
+
+
+@mark.unit
+def test_stream_dialect(project, monkeypatch):
+    project(
+        csv,
+        {
+            'type': 'object',
+            'output': {'kwargs': {'csv_dialect': 'unix', 'csv_delimiter': ';'}},
+        },
+    )
+    formatter = csv.csv_stream_formatter('test')
+    output = formatter.rows(
+        Collection(Event({'f1': 'string', 'f2': 1}), Event({'f1': 'a', 'f2': 2}))
+    )
+    assert output == '"string";"1"\n"a";"2"\n', (
+        'Rows should be written with the dialect and delimiter of the output'
+    )
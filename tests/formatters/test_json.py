@@ -1,6 +1,6 @@
 from syntrend.formatters import json, Event, Collection
 
-from pytest import mark
+from pytest import importorskip, mark
 
 
 @mark.unit
@@ -66,3 +66,43 @@ def test_multiple_objects_as_collection(project, monkeypatch):
     assert (
         len(output) == 5
     ), 'Should generate 3 lines of json output with 2 lines for list encapsulation, and an extra empty line'
+
+
+@mark.unit
+def test_stream_collection(project, monkeypatch):
+    project(json, {'type': 'object', 'output': {'collection': True}})
+    formatter = json.json_stream_formatter('test')
+    output = formatter.header()
+    for idx in range(3):
+        output += formatter.rows(Collection(Event({'f1': 'string', 'f2': idx})))
+    output += formatter.footer()
+    assert output.splitlines() == [
+        '[',
+        '  {"f1": "string", "f2": 0},',
+        '  {"f1": "string", "f2": 1},',
+        '  {"f1": "string", "f2": 2}',
+        ']',
+    ], 'Streamed rows should match a formatted collection'
+
+
+@mark.unit
+def test_stream_jsonl(project, monkeypatch):
+    project(json, {'type': 'object', 'output': {'collection': True}})
+    formatter = json.jsonl_stream_formatter('test')
+    output = formatter.header()
+    for idx in range(2):
+        output += formatter.rows(Collection(Event({'f1': 'string', 'f2': idx})))
+    output += formatter.footer()
+    assert output.splitlines() == [
+        '{"f1": "string", "f2": 0}',
+        '{"f1": "string", "f2": 1}',
+    ], 'Collections should be written as a line per event'
+
+
+@mark.unit
+def test_orjson_encoder(project, monkeypatch):
+    orjson = importorskip('orjson')
+    project(json, {'type': 'object', 'output': {'kwargs': {'json_encoder': 'orjson'}}})
+    formatter = json.json_formatter('test')
+    output = formatter(Collection(Event({'f1': 'string', 'f2': 10}), Event(1.5)))
+    assert [orjson.loads(row) for row in output] == [{'f1': 'string', 'f2': 10}, 1.5]
@@ -0,0 +1,52 @@
+from syntrend.formatters import Formatter, load_queued_formatter
+
+from pytest import mark, raises
+import threading
+
+
+@mark.unit
+def test_events_written_in_order():
+    written = []
+    closed = []
+    formatter = load_queued_formatter(
+        'test', Formatter(written.append, lambda: closed.append(True)), 2
+    )
+    for idx in range(100):
+        formatter.format({'idx': idx})
+    formatter.close()
+    assert written == [{'idx': idx} for idx in range(100)], (
+        'Writer thread should keep the order of events'
+    )
+    assert closed == [True], 'Closing should close the wrapped formatter'
+
+
+@mark.unit
+def test_backpressure():
+    release = threading.Event()
+    formatter = load_queued_formatter(
+        'test', Formatter(lambda _: release.wait(), lambda: None), 1
+    )
+    formatter.format({'idx': 0})  # Taken by the writer thread
+    formatter.format({'idx': 1})  # Fills the queue
+    blocked = threading.Thread(target=formatter.format, args=({'idx': 2},))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive(), 'Events should block while the queue is full'
+    release.set()
+    blocked.join()
+    formatter.close()
+
+
+@mark.unit
+def test_writer_errors_raised():
+    def _format(event):
+        raise OSError('Disk full')
+
+    closed = []
+    formatter = load_queued_formatter(
+        'test', Formatter(_format, lambda: closed.append(True)), 10
+    )
+    formatter.format({'idx': 0})
+    with raises(OSError, match='Disk full'):
+        formatter.close()
+    assert closed == [True], 'Failed outputs should still be closed'
@@ -9,7 +9,7 @@ def test_single_string(project, monkeypatch):
     formatter = sql.sql_formatter('test')
     output = formatter(Collection(Event('generated_string')))
     assert (
-        output[0] == 'insert into test (value) values ("generated_string")'
+        output[0] == "insert into test (value) values ('generated_string');"
     ), 'Should generate an insert statement'
 
 
@@ -19,7 +19,7 @@ def test_single_number(project, monkeypatch):
     formatter = sql.sql_formatter('test')
     output = formatter(Collection(Event(10)))
     assert (
-        output[0] == 'insert into test (value) values (10)'
+        output[0] == 'insert into test (value) values (10);'
     ), 'Should generate an insert statement'
 
 
@@ -29,7 +29,7 @@ def test_single_object(project, monkeypatch):
     formatter = sql.sql_formatter('test')
     output = formatter(Collection(Event({'f1': 'string', 'f2': 10})))
     assert (
-        output[0] == 'insert into test (f1, f2) values ("string", 10)'
+        output[0] == "insert into test (f1, f2) values ('string', 10);"
     ), 'Should generate an insert statement with 2 fields'
 
 
@@ -45,7 +45,7 @@ def test_multiple_objects(project, monkeypatch):
         )
     )
     assert all(
-        [line == 'insert into test (f1, f2) values ("string", 10)' for line in output]
+        [line == "insert into test (f1, f2) values ('string', 10);" for line in output]
     ), 'All lines should generate an insert statement'
     assert len(output) == 3, 'Should generate 3 lines of sql output'
 
@@ -62,8 +62,76 @@ def test_multiple_objects_as_collection(project, monkeypatch):
         )
     )
     assert all(
-        [line == 'insert into test (f1, f2) values ("string", 10)' for line in output]
+        [line == "insert into test (f1, f2) values ('string', 10);" for line in output]
     ), 'All lines should generate an insert statement'
     assert (
         len(output) == 3
     ), 'Should generate 3 lines of sql output, no changes for collections'
+
+
+@mark.unit
+def test_stream_collection(project, monkeypatch):
+    project(sql, {'type': 'object', 'output': {'collection': True}})
+    formatter = sql.sql_stream_formatter('test')
+    output = formatter.header()
+    for idx in range(3):
+        output += formatter.rows(Collection(Event({'f1': 'string', 'f2': idx})))
+    output += formatter.footer()
+    assert output.splitlines() == [
+        f"insert into test (f1, f2) values ('string', {idx});" for idx in range(3)
+    ], 'Each streamed row should be an insert statement'
+
+
+@mark.unit
+def test_literals(project, monkeypatch):
+    project(sql, {'type': 'object'})
+    formatter = sql.sql_formatter('test')
+    output = formatter(
+        Collection(Event({'f1': "it's", 'f2': None, 'f3': True, 'f 4': 1.5}))
+    )
+    assert output[0] == (
+        "insert into test (f1, f2, f3, \"f 4\") values ('it''s', NULL, TRUE, 1.5);"
+    ), 'Should escape quotes and write NULL and boolean literals'
+
+
+@mark.unit
+def test_stream_batches(project, monkeypatch):
+    project(
+        sql,
+        {
+            'type': 'object',
+            'output': {'collection': True, 'kwargs': {'sql_batch_size': 2}},
+        },
+    )
+    formatter = sql.sql_stream_formatter('test')
+    output = formatter.header()
+    for idx in range(3):
+        output += formatter.rows(Collection(Event({'f1': idx})))
+    output += formatter.footer()
+    assert output.splitlines() == [
+        'insert into test (f1) values (0),',
+        '  (1);',
+        'insert into test (f1) values (2);',
+    ], 'Rows should be inserted in batches, with the remaining rows when closing'
+
+
+@mark.unit
+def test_stream_copy(project, monkeypatch):
+    project(
+        sql,
+        {
+            'type': 'object',
+            'output': {'collection': True, 'kwargs': {'sql_mode': 'copy'}},
+        },
+    )
+    formatter = sql.sql_stream_formatter('test')
+    output = formatter.header()
+    output += formatter.rows(Collection(Event({'f1': 'a\tb', 'f2': None})))
+    output += formatter.rows(Collection(Event({'f1': 'c', 'f2': False})))
+    output += formatter.footer()
+    assert output.splitlines() == [
+        'copy test (f1, f2) from stdin;',
+        'a\\tb\t\\N',
+        'c\tf',
+        '\\.',
+    ], 'Rows should be written as a single copy block'
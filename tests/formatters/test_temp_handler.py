@@ -0,0 +1,32 @@
+from syntrend.formatters import TempHandler, Event, TH_TEMP_PATH
+from syntrend.utils import writers
+
+from pytest import mark
+
+
+@mark.unit
+def test_spool_round_trip(project):
+    project(writers, {'type': 'object', 'output': {'collection': True}})
+    handler = TempHandler('test')
+    handler.load()
+    events = [Event({'f1': 'string', 'f2': idx}) for idx in range(100)]
+    for event in events:
+        handler.write(event)
+    assert len(handler) == 100, 'Spool should track the number of written events'
+    assert list(handler.get_collection()) == events, 'Events should be read in order'
+    assert list(handler.get_collection()) == events, 'Spool should be re-readable'
+    temp_path = handler.args[TH_TEMP_PATH]
+    handler.close()
+    assert not temp_path.exists(), 'Temp file should be removed on close'
+
+
+@mark.unit
+def test_spool_preserves_default_values(project):
+    project(writers, {'type': 'string', 'output': {'collection': True}})
+    handler = TempHandler('test')
+    handler.load()
+    handler.write(Event('generated_string'))
+    (event,) = list(handler.get_collection())
+    handler.close()
+    assert event.use_default, 'Scalar events should keep their default flag'
+    assert event['value'] == 'generated_string'
@@ -44,3 +44,123 @@ def test_register_generator():
     assert (
         test_gen.__class__ == exp_gen.__class__
     ), "Should have returned the 'test' generator"
+
+
+@fixture(scope='function')
+def manager():
+    from syntrend.utils import manager as m
+    from syntrend import formatters
+
+    formatters.load_formatters()
+    mgr = m.SeriesManager()
+    mgr.load()
+    return mgr
+
+
+@mark.unit
+@mark.parametrize(
+    'prop_cfg,value_check',
+    [
+        ({'type': 'integer', 'min_offset': 1, 'max_offset': 3}, lambda v: 1 <= v <= 3),
+        ({'type': 'float', 'min_offset': 0, 'max_offset': 1}, lambda v: 0 <= v <= 1),
+        (
+            {'type': 'string', 'min_length': 2, 'max_length': 4},
+            lambda v: 2 <= len(v) <= 4,
+        ),
+        ({'type': 'hex', 'use_upper': True}, lambda v: v == v.upper()),
+        ({'type': 'choice', 'items': ['a', 'b']}, lambda v: v in {'a', 'b'}),
+        ({'type': 'uuid'}, lambda v: len(v) == 36 and v[14] == '4'),
+        ({'type': 'static', 'value': 'x'}, lambda v: v == 'x'),
+    ],
+    ids=['integer', 'float', 'string', 'hex', 'choice', 'uuid', 'static'],
+)
+def test_render_batch(manager, prop_cfg, value_check):
+    gen = generators.get_generator('this', Prop_Def(**prop_cfg), manager)
+    assert gen.supports_batch(), 'Generators without expressions support batches'
+    values = gen.render_batch(50)
+    assert len(values) == 50, 'Batch should render the requested number of values'
+    assert all(value_check(value) for value in values)
+    assert gen.iteration_value == values[-1], 'Last value should be the current value'
+
+
+@mark.unit
+def test_render_batch_object(manager):
+    prop_def = Prop_Def(
+        type='object',
+        start={'f1': 0},
+        properties={
+            'f1': {'type': 'integer'},
+            'f2': {'type': 'static', 'value': 'x'},
+        },
+    )
+    gen = generators.get_generator('this', prop_def, manager)
+    values = gen.render_batch(10)
+    assert values[0] == {'f1': 0}, 'First iteration should use the start value'
+    assert all(list(value) == ['f1', 'f2'] for value in values[1:])
+
+
+@mark.unit
+def test_no_batch_with_expression(manager):
+    prop_def = Prop_Def(
+        type='object',
+        properties={'f1': {'type': 'integer', 'expression': 'new + 1'}},
+    )
+    gen = generators.get_generator('this', prop_def, manager)
+    assert not gen.supports_batch(), 'Expressions must be rendered one at a time'
+
+
+@mark.unit
+def test_iteration_frame(manager):
+    prop_def = Prop_Def(
+        name='test',
+        type='object',
+        properties={'f1': {'type': 'integer'}, 'f2': {'type': 'float'}},
+    )
+    gen = generators.get_generator('frame_test', prop_def, manager)
+    frame = manager.iteration_frame('frame_test')
+    assert frame.size == 3, 'Each generator should be allocated a slot'
+    frame.seek(1)
+    value = gen.render()
+    assert gen.render() is value, 'Values should be cached for the iteration'
+    assert frame.values[gen.properties['f1'].slot] == value['f1']
+    frame.rollback()
+    assert all(value is generators.UNSET for value in frame.values), (
+        'Rolling back should clear the values of the iteration'
+    )
+    frame.seek(2)
+    assert gen.render() is not value, 'New iterations should render new values'
+
+
+@mark.unit
+def test_compact_generators(manager):
+    prop_def = Prop_Def(
+        name='test',
+        type='object',
+        properties={
+            'f1': {'type': 'integer', 'min_offset': 1},
+            'f2': {'type': 'integer', 'min_offset': 2},
+            'tags': {'type': 'list', 'sub_type': 'string', 'max_length': 2},
+        },
+    )
+    gen = generators.get_generator('this', prop_def, manager)
+    f1, f2 = gen.properties['f1'], gen.properties['f2']
+    assert not hasattr(f1, '__dict__'), 'Generators should only use slots'
+    assert type(f1.kwargs) is type(f2.kwargs), 'Kwargs types should be shared'
+    assert 1 <= len(gen.render()['tags']) <= 2, 'Lists should load their sub-type'
+
+
+@mark.unit
+def test_typed_generator_classes(manager):
+    from syntrend.generators import integer, __base_types
+
+    gen_cls = generators.GENERATORS['integer']
+    assert gen_cls.__mro__[1:3] == (
+        integer.IntegerGenerator,
+        generators.PropertyGenerator,
+    ), 'Generator methods should take precedence over expression types'
+    assert issubclass(gen_cls, __base_types.IntegerType)
+    gen = generators.get_generator('this', Prop_Def(name='x', type='integer'), manager)
+    value = gen.render()
+    assert gen + 1 == value + 1 and gen * 2 == value * 2, (
+        'Operators should use the value of the current iteration'
+    )
@@ -0,0 +1,150 @@
+from syntrend.config import model
+from syntrend.utils import dependencies, historian, manager as m
+from syntrend import formatters, generators
+
+from jinja2 import Environment
+from pytest import mark, fixture, raises
+
+Prop_Def = model.PropertyDefinition
+
+
+@fixture(scope='function')
+def load_object():
+    generators.load_generators()
+    formatters.load_formatters()
+    mgr = m.SeriesManager()
+    mgr.load()
+
+    def _load(**properties):
+        prop_def = Prop_Def(name='this', type='object', properties=properties)
+        return generators.get_generator('this', prop_def, mgr)
+
+    return _load
+
+
+@mark.unit
+@mark.parametrize(
+    'source,references',
+    [
+        ('this().sensor > 5', {('this', 'sensor')}),
+        (
+            'this(0)["sensor"].value + other().x',
+            {('this', 'sensor', 'value'), ('other', 'x')},
+        ),
+        ('this(1).sensor + 2', set()),
+        ('path("this.a.b") ~ this()', {('this', 'a', 'b'), ('this',)}),
+        ('unknown().a + new', set()),
+    ],
+)
+def test_find_references(source, references):
+    assert (
+        dependencies.find_references(Environment(), source, {'this', 'other'})
+        == references
+    )
+
+
+@mark.unit
+def test_render_order(load_object):
+    gen = load_object(
+        status={'type': 'string', 'expression': '"on" if this().nested.level else ""'},
+        nested={
+            'type': 'object',
+            'properties': {
+                'level': {'type': 'integer', 'expression': 'this().sensor * 2'},
+            },
+        },
+        sensor={'type': 'integer'},
+    )
+    dependencies.resolve(Environment(), {'this': gen})
+    assert gen.render_order == ['sensor', 'nested', 'status'], (
+        'Referenced properties should be rendered first'
+    )
+
+
+@mark.unit
+def test_cycle(load_object):
+    gen = load_object(
+        a={'type': 'integer', 'expression': 'this().b + 1'},
+        b={'type': 'integer', 'expression': 'this().a + 1'},
+    )
+    with raises(ValueError, match='cycle'):
+        dependencies.resolve(Environment(), {'this': gen})
+
+
+@mark.unit
+def test_mutual_object_references(load_object):
+    gen_a = load_object(
+        p={'type': 'integer', 'expression': 'b().q + 1'}, s={'type': 'integer'}
+    )
+    gen_b = load_object(
+        q={'type': 'integer'}, r={'type': 'integer', 'expression': 'a().s + 1'}
+    )
+    # Objects referencing different properties of each other are not a cycle
+    dependencies.resolve(Environment(), {'a': gen_a, 'b': gen_b})
+    assert sorted(gen_a.render_order) == ['p', 's']
+    assert sorted(gen_b.render_order) == ['q', 'r']
+
+
+@mark.unit
+@mark.parametrize(
+    'source,projections',
+    [
+        ('this().sensor > 5', {}),
+        (
+            'this(1).sensor + this(3)["count"]',
+            {'this': (3, frozenset({'sensor', 'count'}), frozenset())},
+        ),
+        (
+            'this(2) or other.level.mean',
+            {
+                'this': (2, None, frozenset()),
+                'other': (0, frozenset(), frozenset({('level',)})),
+            },
+        ),
+        (
+            'this().sensor | series(5) > 2',
+            {'this': (0, frozenset(), frozenset({('sensor',)}))},
+        ),
+        (
+            'this().nested.level | series(5) > 2',
+            {'this': (0, frozenset(), frozenset({('nested', 'level')}))},
+        ),
+        ('this(other().index).x', {'this': (None, frozenset({'x'}), frozenset())}),
+        ('[this][0]', {'this': (None, None, None)}),
+    ],
+)
+def test_find_history(source, projections):
+    assert (
+        dependencies.find_history(Environment(), source, {'this', 'other'})
+        == projections
+    )
+
+
+@mark.unit
+def test_history_projections(load_object):
+    gen = load_object(
+        delta={'type': 'integer', 'expression': 'this().sensor - this(1).sensor'},
+        sensor={'type': 'integer'},
+        label={'type': 'string'},
+    )
+    projections = dependencies.history_projections(
+        Environment(), {'this': gen, 'other': gen.properties['label']}
+    )
+    assert projections['this'] == (1, frozenset({'sensor'}), frozenset())
+    assert projections['other'] == historian.NO_HISTORY, (
+        'Unreferenced objects should keep no history'
+    )
+
+
+@mark.unit
+def test_history_objects(load_object):
+    gen = load_object(
+        delta={'type': 'integer', 'expression': 'other(1).sensor + 1'},
+    )
+    other = load_object(sensor={'type': 'integer'})
+    unrelated = load_object(label={'type': 'string'})
+    assert dependencies.history_objects(
+        Environment(), {'this': gen, 'other': other, 'unrelated': unrelated}
+    ) == {'this', 'other'}, (
+        'Both the objects reading and providing previous values should be listed'
+    )
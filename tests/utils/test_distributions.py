@@ -1,9 +1,10 @@
-from syntrend.config import model
-from syntrend.utils import distributions as d, manager as m
+from syntrend.config import model, CONFIG
+from syntrend.utils import distributions as d, engine, manager as m
 
 from functools import partial
+import sys
 
-from pytest import mark, fixture
+from pytest import mark, fixture, importorskip
 
 Prop_Def = partial(model.PropertyDefinition, name='test')
 
@@ -63,3 +64,46 @@ def test_std_dev_distribution(std_dev_factor):
     assert (
         min(gen_values) > 5 - offset and max(gen_values) < 5 + offset
     ), 'All Values must be within the current tolerance'
+
+
+@mark.unit
+def test_batch_distribution_python():
+    prop_dist = model.PropertyDistribution(
+        type=model.DistributionTypes.Linear, min_offset=0, max_offset=5
+    )
+    dist_func = d.get_batch_distribution(prop_dist)
+    gen_values = dist_func([5] * 100)
+    assert len(gen_values) == 100, 'A value should be returned for every input'
+    assert all([5 <= x <= 10 for x in gen_values]), (
+        'All Values must be within the current tolerance'
+    )
+
+
+@mark.unit
+def test_batch_distribution_numpy():
+    numpy = importorskip('numpy')
+    prop_dist = model.PropertyDistribution(
+        type=model.DistributionTypes.StdDev, std_dev_factor=1.0
+    )
+    dist_func = d.get_batch_distribution(prop_dist, numpy.random.default_rng())
+    gen_values = dist_func(numpy.full(1000, 5.0))
+    assert gen_values.min() > -1 and gen_values.max() < 11, (
+        'All Values must be within the current tolerance'
+    )
+
+
+@mark.unit
+def test_numpy_engine_fallback(monkeypatch, caplog):
+    monkeypatch.setattr(CONFIG.config, 'engine', engine.ENGINE_NUMPY)
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    engine.load_numpy.cache_clear()
+    try:
+        assert engine.numpy_random() is None, (
+            'Missing NumPy should use the Python engine'
+        )
+        assert engine.numpy_random() is None
+    finally:
+        engine.load_numpy.cache_clear()
+    assert caplog.text.count('NumPy is not installed') == 1, (
+        'Missing NumPy should only be reported once'
+    )
@@ -0,0 +1,120 @@
+from syntrend.utils import expressions
+
+from jinja2 import exceptions, pass_context
+from pytest import mark, raises
+
+
+@mark.unit
+def test_shared_compilation():
+    env = expressions.create_environment(10)
+    expr_a = expressions.compile_expression(env, 'value * 2')
+    expr_b = expressions.compile_expression(env, 'value * 2')
+    assert expr_a is expr_b, 'Identical expressions should share their compilation'
+    assert expr_a(value=2) == 4
+    assert expr_b(value=[1]) == [1, 1]
+
+
+@mark.unit
+def test_lru_eviction():
+    env = expressions.create_environment(1)
+    expr_a = expressions.compile_expression(env, '1 + 1')
+    expressions.compile_expression(env, '2 + 2')
+    assert expressions.compile_expression(env, '1 + 1') is not expr_a, (
+        'Least recently used expressions should be evicted'
+    )
+
+
+@mark.unit
+@mark.parametrize(
+    'source',
+    ['1 %}{% set result = 2', 'value }}{{ 2', 'value value', '1 + 1 %}'],
+)
+def test_trailing_tokens_rejected(source):
+    env = expressions.create_environment(10)
+    with raises(exceptions.TemplateSyntaxError):
+        expressions.compile_expression(env, source)
+
+
+@mark.unit
+def test_bytecode_cache(tmp_path):
+    env = expressions.create_environment(10, tmp_path)
+    assert expressions.compile_expression(env, 'sin(0) | round')(sin=abs) == 0
+    assert len(list(tmp_path.iterdir())) == 1, 'Compiled bytecode should be cached'
+    env = expressions.create_environment(10, tmp_path)
+    assert expressions.compile_expression(env, 'sin(0) | round')(sin=abs) == 0
+
+
+@mark.unit
+@mark.parametrize(
+    'source',
+    [
+        'new * 2 + interval',
+        '(new - 1) ** 2 // 3 % 5',
+        '-new if new > 2 and not interval else new / 4',
+        'new in [1, 2, 3] or interval != 0',
+        '1 < new <= 10',
+        'new ~ "-" ~ interval',
+        'values[1:] + values[:1]',
+        'values[0] + mapping["a"] + mapping.a',
+        '{"a": new, "b": (interval, 2)}',
+        'add(new, offset=interval)',
+        'new / 3 | round(2)',
+        'values | join(",")',
+        'new is odd',
+        'missing is defined',
+        'new if missing else interval',
+    ],
+)
+def test_native_matches_jinja(source):
+    env = expressions.create_environment(10)
+    env.globals['add'] = lambda a, offset=0: a + offset
+    context = {
+        'new': 5,
+        'interval': 3,
+        'values': [1, 2, 3],
+        'mapping': {'a': 10},
+    }
+    native_expr = expressions.compile_native(env, source)
+    assert native_expr is not None, 'Expression should be translated'
+    assert native_expr(**context) == expressions.compile_expression(env, source)(
+        **context
+    )
+
+
+@mark.unit
+def test_native_undefined():
+    env = expressions.create_environment(10)
+    native_expr = expressions.compile_native(env, 'missing + 1')
+    with raises(exceptions.UndefinedError, match="'missing' is undefined"):
+        native_expr(new=1)
+
+
+@mark.unit
+def test_native_shared_compilation():
+    env = expressions.create_environment(10)
+    native_expr = expressions.compile_native(env, 'value * 2')
+    assert expressions.compile_native(env, 'value * 2') is native_expr, (
+        'Identical expressions should share their native function'
+    )
+    assert expressions.compile_expression(env, 'value * 2') is not native_expr
+    assert native_expr(value=2) == 4
+
+
+@mark.unit
+def test_native_fallback():
+    env = expressions.create_environment(10)
+    assert expressions.compile_native(env, 'f(*args)') is None, (
+        'Unsupported syntax should be left to Jinja'
+    )
+
+
+@mark.unit
+def test_native_context_filter():
+    env = expressions.create_environment(10)
+    env.filters['scoped'] = pass_context(lambda context, value: context['new'] + value)
+    assert expressions.compile_native(env, 'interval | scoped') is None, (
+        'Filters taking the context should be left to Jinja'
+    )
+    assert (
+        expressions.compile_expression(env, 'interval | scoped')(new=1, interval=2) == 3
+    )
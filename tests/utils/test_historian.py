@@ -0,0 +1,91 @@
+from syntrend.utils import historian, filters
+
+from pytest import approx, mark
+from types import SimpleNamespace
+import random
+
+
+@mark.unit
+def test_rolling_aggregates():
+    window = historian.NumericSeries(50)
+    values = [random.uniform(-100, 100) for _ in range(500)]
+    for idx, value in enumerate(values):
+        window.append(value)
+        expected = values[max(0, idx - 49) : idx + 1]
+        assert window.count == len(expected)
+        assert window.min == min(expected) and window.max == max(expected)
+        assert window.sum == approx(sum(expected))
+        assert window.mean == approx(sum(expected) / len(expected))
+    assert window.latest(3) == values[:-4:-1], 'Latest values should come first'
+
+
+@mark.unit
+def test_empty_series():
+    window = historian.NumericSeries(10)
+    assert window.count == 0 and window.min is None and window.mean is None
+    assert not filters.series(window, 5) > 0, 'Empty series should not match'
+
+
+@mark.unit
+def test_historian_fields():
+    history = historian.Historian(window=3)
+    for idx in range(5):
+        history.append({'count': idx, 'name': 'x', 'flag': True})
+    assert history[0] == {'count': 4, 'name': 'x', 'flag': True}
+    assert set(history.series) == {('count',)}, 'Only numeric fields should aggregate'
+    assert history.get_series(('count',)).mean == 3
+    scalar_history = historian.Historian(window=3)
+    scalar_history.append(1.5)
+    assert scalar_history.get_series().sum == 1.5
+
+
+@mark.unit
+def test_series_filter():
+    window = historian.NumericSeries(4)
+    for value in [1, 5, 6, 7, 8]:
+        window.append(value)
+    assert filters.series(window, 4) > 4, 'All values of the window are > 4'
+    assert not filters.series(window, 4) > 5
+    assert filters.series(window, 2) >= 7, 'Shorter series only compare latest values'
+    assert 6 in filters.series(window, 3) and 6 not in filters.series(window, 2)
+    assert filters.series(window, 1) == 8
+
+
+@mark.unit
+def test_historian_projection():
+    projection = historian.HistoryProjection(
+        2, frozenset({'name'}), frozenset({('count',)})
+    )
+    history = historian.Historian(window=3, projection=projection)
+    for idx in range(5):
+        history.append({'count': idx, 'name': str(idx), 'size': idx * 2})
+    assert len(history) == 2, 'Only the referenced depth should be kept'
+    assert history[0] == {'name': '4'}, 'Only referenced fields should be kept'
+    assert set(history.series) == {('count',)}
+    assert history.tracking
+    assert not historian.Historian(projection=historian.NO_HISTORY).tracking
+
+
+@mark.unit
+def test_nested_series():
+    history = historian.Historian(window=3)
+    for idx in range(3):
+        history.append({'level': -idx, 'a': {'level': idx}, 'b': {'level': idx * 2}})
+    assert history.get_series(('a', 'level')).max == 2
+    assert history.get_series(('b', 'level')).max == 4, (
+        'Fields with the same name in different objects should aggregate apart'
+    )
+    assert history.get_series(('level',)).max == 0
+
+
+@mark.unit
+def test_object_reference_fields(monkeypatch):
+    history = historian.Historian(window=3)
+    history.append({'generator': 2, 'historian': 3})
+    manager = SimpleNamespace(generators={'obj': None}, historians={'obj': history})
+    monkeypatch.setattr(filters, 'MANAGER', manager)
+    reference = filters.ObjectReference('obj')
+    assert reference.generator.sum == 2 and reference.historian.sum == 3, (
+        'Fields should not be shadowed by the attributes of the reference'
+    )
+    assert reference(1) == {'generator': 2, 'historian': 3}
@@ -0,0 +1,88 @@
+from syntrend.config import model
+from syntrend.utils import manager as m
+from syntrend import formatters, generators
+
+from pytest import mark, fixture
+
+Prop_Def = model.PropertyDefinition
+
+
+@fixture(scope='function')
+def manager(monkeypatch):
+    def _manager(seed=''):
+        generators.load_generators()
+        formatters.load_formatters()
+        monkeypatch.setattr(m.CONFIG.config, 'seed', seed)
+        mgr = m.SeriesManager()
+        mgr.load()
+        return mgr
+
+    return _manager
+
+
+@mark.unit
+def test_seeded_streams_repeat(manager):
+    first, second = manager('42'), manager('42')
+    assert [first.random_stream('obj', 'prop').random() for _ in range(2)] == [
+        second.random_stream('obj', 'prop').random() for _ in range(2)
+    ], 'Streams should repeat for the same seed and key'
+
+
+@mark.unit
+def test_seeded_streams_reload(manager):
+    mgr = manager('42')
+    first = mgr.random_stream('obj', 'prop').random()
+    mgr.load()
+    assert mgr.random_stream('obj', 'prop').random() == first, (
+        'Streams should restart when the project is loaded again'
+    )
+
+
+@mark.unit
+def test_seeded_streams_independent(manager):
+    mgr = manager('42')
+    values = [
+        mgr.random_stream('obj', 'prop').random(),
+        mgr.random_stream('obj', 'prop').random(),
+        mgr.random_stream('obj', 'other').random(),
+    ]
+    assert len(set(values)) == 3, 'Each stream should be seeded independently'
+
+
+@mark.unit
+def test_shard_streams_independent(manager):
+    first, second = manager('42'), manager('42')
+    second.shard = m.sharding.Shard(1, 2)
+    assert first.random_stream('obj').random() != second.random_stream('obj').random()
+
+
+@mark.unit
+@mark.parametrize('prop_type', ['integer', 'float', 'string', 'uuid', 'name'])
+def test_seeded_generators(manager, prop_type):
+    def _render(mgr):
+        prop_def = Prop_Def(name='test', type=prop_type)
+        return generators.get_generator('this', prop_def, mgr).render_batch(5)
+
+    assert _render(manager('42')) == _render(manager('42')), (
+        'Generators should render the same values for the same seed'
+    )
+
+
+@mark.unit
+def test_seed_reset_on_load(manager, monkeypatch):
+    mgr = manager('42')
+    seeded = mgr.random_stream('obj').random()
+    monkeypatch.setattr(m.CONFIG.config, 'seed', '')
+    mgr.load()
+    assert mgr.random_stream('obj').random() != seeded, (
+        'Projects without a seed should not reuse the seed of a previous load'
+    )
+
+
+@mark.unit
+def test_shard_seed(manager):
+    first, second = manager(''), manager('')
+    first.shard_seed = second.shard_seed = '7'
+    assert (
+        first.random_stream('obj').random() == second.random_stream('obj').random()
+    ), 'Shards of a run should derive their streams from the shared seed'
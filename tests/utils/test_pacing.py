@@ -0,0 +1,54 @@
+from syntrend.utils import pacing
+
+from pytest import approx, mark, raises
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@mark.unit
+def test_anchored_schedule():
+    clock = FakeClock()
+    pacer = pacing.Pacer(2, clock, clock.sleep)
+    pacer.wait(10, 'a')
+    clock.now += 0.3  # time spent rendering/writing
+    pacer.wait(12, 'a')
+    assert clock.now == approx(101.0), (
+        'Event should be due 1s after the anchor at speed 2'
+    )
+    assert clock.sleeps == [approx(0.7)], 'Work between events should not add drift'
+
+
+@mark.unit
+def test_lag():
+    clock = FakeClock()
+    pacer = pacing.Pacer(1, clock, clock.sleep)
+    pacer.wait(0, 'a')
+    clock.now += 5
+    assert pacer.wait(2, 'a') == 3, 'Event should be 3s behind its schedule'
+    assert not clock.sleeps, 'Late events should not wait'
+    assert pacer.max_lag == {'a': 3}
+
+
+@mark.unit
+def test_rate_limit():
+    clock = FakeClock()
+    pacer = pacing.Pacer(0, clock, clock.sleep)
+    pacer.set_rate('a', 4)
+    for _ in range(5):
+        pacer.wait(0, 'a')
+        pacer.wait(0, 'b')
+    assert clock.now == 101.0, 'Events of "a" should be limited to 4/sec'
+    assert clock.sleeps == [0.25] * 4
+    with raises(ValueError):
+        pacer.set_rate('b', 0)
@@ -0,0 +1,26 @@
+from syntrend.utils.scheduler import EventScheduler
+
+from pytest import mark
+
+
+@mark.unit
+def test_time_order():
+    scheduler = EventScheduler()
+    for timestamp, name in [(3, 'c'), (1, 'a'), (2, 'b')]:
+        scheduler.push(timestamp, name, {'ts': timestamp})
+    popped = [scheduler.pop() for _ in range(3)]
+    assert [event[0] for event in popped] == [1, 2, 3], (
+        'Earliest timestamp should be next'
+    )
+    assert [event[1] for event in popped] == ['a', 'b', 'c']
+    assert len(scheduler) == 0, 'All events should be popped'
+
+
+@mark.unit
+def test_stable_ties():
+    scheduler = EventScheduler()
+    for name in ['obj2', 'obj1', 'obj3']:
+        scheduler.push(5, name, {'value': {}})
+    assert [scheduler.pop()[1] for _ in range(3)] == ['obj2', 'obj1', 'obj3'], (
+        'Events sharing a timestamp should keep the order they were scheduled in'
+    )
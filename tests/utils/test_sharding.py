@@ -0,0 +1,99 @@
+from syntrend.config import model
+from syntrend.utils import sharding, writers
+
+from click.testing import CliRunner
+from pathlib import Path
+from pytest import mark, fixture
+
+
+@fixture(scope='function')
+def project(monkeypatch, tmp_path):
+    def _config(**output):
+        project_config = model.ProjectConfig(
+            objects={'test': {'type': 'integer', 'output': output}}
+        )
+        monkeypatch.setattr(sharding, 'CONFIG', project_config)
+        monkeypatch.setattr(writers, 'CONFIG', project_config)
+
+    return _config
+
+
+@mark.unit
+def test_single_shard(project):
+    project(count=10)
+    assert sharding.shard_range('test', sharding.SINGLE_SHARD) == range(10)
+    assert sharding.first_sequence('test', sharding.SINGLE_SHARD) == 0
+
+
+@mark.unit
+def test_console_events(project):
+    project(count=10)
+    ranges = [sharding.shard_range('test', sharding.Shard(idx, 3)) for idx in range(3)]
+    assert ranges == [range(0, 4), range(4, 8), range(8, 10)], (
+        'Iterations should be split into contiguous shards'
+    )
+
+
+@mark.unit
+def test_file_events_aligned_to_roll_count(project, tmp_path):
+    project(count=10, directory=str(tmp_path), roll_count=3)
+    shards = [sharding.Shard(idx, 3) for idx in range(3)]
+    ranges = [sharding.shard_range('test', shard) for shard in shards]
+    assert ranges == [range(0, 6), range(6, 10), range(10, 10)], (
+        'Shards should start on a file boundary'
+    )
+    assert [sharding.first_sequence('test', shard) for shard in shards[:2]] == [0, 2]
+
+
+@mark.unit
+def test_file_collection_per_shard(project, tmp_path):
+    project(count=10, directory=str(tmp_path), collection=True)
+    shards = [sharding.Shard(idx, 2) for idx in range(2)]
+    assert [sharding.shard_range('test', shard) for shard in shards] == [
+        range(0, 5),
+        range(5, 10),
+    ]
+    assert [sharding.first_sequence('test', shard) for shard in shards] == [0, 1], (
+        'Each shard should write its own collection file'
+    )
+
+
+@mark.unit
+@mark.parametrize(
+    'output',
+    [
+        {'time_field': 'value'},
+        {'collection': True},
+        {'filename_format': '{name}.{format}', 'directory': '.'},
+        {'format': 'sqlite', 'directory': '.'},
+    ],
+    ids=['time_field', 'console_collection', 'no_id', 'sink'],
+)
+def test_unshardable(project, output):
+    project(count=10, **output)
+    assert not sharding.is_shardable('test')
+    assert sharding.shard_range('test', sharding.Shard(0, 2)) == range(10)
+    assert sharding.shard_range('test', sharding.Shard(1, 2)) == range(0)
+
+
+@mark.unit
+def test_history_unshardable(project):
+    project(count=10)
+    assert sharding.is_shardable('test', {'other'})
+    assert not sharding.is_shardable('test', {'test'}), (
+        'Objects referencing previous values should be rendered by a single shard'
+    )
+    assert sharding.shard_range('test', sharding.Shard(0, 2), {'test'}) == range(10)
+    assert sharding.shard_range('test', sharding.Shard(1, 2), {'test'}) == range(0)
+
+
+@mark.unit
+def test_workers_with_history():
+    from syntrend.cli import generate
+
+    project_file = Path('tests/assets/uc_num_trend.yaml').absolute()
+    runner = CliRunner(mix_stderr=False)
+    with runner.isolated_filesystem():
+        result = runner.invoke(generate, [str(project_file), '--workers', '2'])
+    assert result.exit_code == 0, result.stderr
+    assert result.stdout.split() == ['1', '2', '3', '4', '5']
@@ -0,0 +1,273 @@
+from syntrend.config import model
+from syntrend.utils import writers
+from syntrend import generators
+
+from click.testing import CliRunner
+from pytest import importorskip, mark, fixture, raises
+import bz2
+import gzip
+import sqlite3
+
+
+@fixture(scope='function')
+def file_handler(monkeypatch, tmp_path):
+    def _handler(**output):
+        output = {'directory': str(tmp_path), 'format': 'json'} | output
+        project_config = model.ProjectConfig(
+            objects={'test': {'type': 'integer', 'output': output}}
+        )
+        monkeypatch.setattr(writers, 'CONFIG', project_config)
+        handler = writers.FileHandler('test')
+        handler.load()
+        return handler
+
+    return _handler
+
+
+@mark.unit
+def test_file_per_event(file_handler, tmp_path):
+    handler = file_handler()
+    for idx in range(3):
+        handler.write(f'{idx}\n')
+    handler.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'test_1.json',
+        'test_2.json',
+        'test_3.json',
+    ], 'Events should default to one file per event'
+    assert tmp_path.joinpath('test_3.json').read_text() == '2\n'
+
+
+@mark.unit
+def test_roll_by_count(file_handler, tmp_path):
+    handler = file_handler(roll_count=2)
+    for idx in range(5):
+        handler.write(f'{idx}\n')
+    handler.close()
+    assert tmp_path.joinpath('test_1.json').read_text() == '0\n1\n'
+    assert tmp_path.joinpath('test_2.json').read_text() == '2\n3\n'
+    assert tmp_path.joinpath('test_3.json').read_text() == '4\n'
+
+
+@mark.unit
+def test_roll_by_size(file_handler, tmp_path):
+    handler = file_handler(roll_count=0, roll_size=4)
+    for idx in range(5):
+        handler.write(f'{idx}\n')
+    handler.close()
+    assert tmp_path.joinpath('test_1.json').read_text() == '0\n1\n'
+    assert len(list(tmp_path.iterdir())) == 3, 'Files should roll after 4 bytes'
+
+
+@mark.unit
+def test_single_file_without_id(file_handler, tmp_path):
+    handler = file_handler(filename_format='{name}.{format}')
+    for idx in range(3):
+        handler.write(f'{idx}\n')
+    handler.close()
+    assert tmp_path.joinpath('test.json').read_text() == '0\n1\n2\n', (
+        'Events should be appended to a file without an id placeholder'
+    )
+
+
+@mark.unit
+def test_flush_by_records(file_handler, tmp_path):
+    handler = file_handler(roll_count=0, flush_records=2)
+    target = tmp_path.joinpath('test_1.json')
+    handler.write('0\n')
+    assert target.read_text() == '', 'Content should be buffered until flushed'
+    handler.write('1\n')
+    assert target.read_text() == '0\n1\n', 'Content should flush after 2 records'
+    handler.close()
+
+
+@mark.unit
+def test_invalid_limit(file_handler):
+    with raises(ValueError):
+        file_handler(roll_size=-1)
+
+
+@mark.unit
+def test_compression_by_extension(file_handler, tmp_path):
+    handler = file_handler(filename_format='{name}_{id}.json.gz', roll_count=2)
+    for idx in range(3):
+        handler.write(f'{idx}\n')
+    handler.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'test_1.json.gz',
+        'test_2.json.gz',
+    ]
+    assert gzip.decompress(tmp_path.joinpath('test_1.json.gz').read_bytes()) == (
+        b'0\n1\n'
+    ), 'Each rolled file should be a complete gzip stream'
+
+
+@mark.unit
+@mark.parametrize('compression_thread', [False, True])
+def test_compression_setting(file_handler, tmp_path, compression_thread):
+    handler = file_handler(
+        collection=True, compression='bz2', compression_thread=compression_thread
+    )
+    for idx in range(100):
+        handler.write(f'{idx}\n')
+    handler.close()
+    target = tmp_path.joinpath('test_1.json.bz2')
+    assert bz2.decompress(target.read_bytes()).decode() == ''.join(
+        f'{idx}\n' for idx in range(100)
+    ), 'The extension of the compression should be added to the filename'
+
+
+@mark.unit
+def test_close_after_compression_error(file_handler):
+    handler = file_handler(collection=True, compression='gzip')
+    handler.write('0\n')
+    raw_handle = handler.args['raw_handle']
+
+    def _close():
+        raise OSError('Disk full')
+
+    handler.args['handle'].close = _close
+    with raises(OSError, match='Disk full'):
+        handler.close()
+    assert raw_handle.closed, 'The underlying file should be closed on errors'
+    assert handler.args['handle'] is None and handler.args['raw_handle'] is None
+
+
+@mark.unit
+def test_invalid_compression(file_handler):
+    with raises(ValueError, match='compression'):
+        file_handler(compression='zip')
+
+
+@mark.unit
+def test_console_collection_chunks(monkeypatch, capsys):
+    output = {'collection': True, 'console_collection_format': '{name}:{nl}{body}|'}
+    project_config = model.ProjectConfig(
+        objects={'test': {'type': 'integer', 'output': output}}
+    )
+    monkeypatch.setattr(writers, 'CONFIG', project_config)
+    handler = writers.ConsoleHandler('test')
+    handler.load()
+    for chunk in ['[', '1,', '2]']:
+        handler.write(chunk)
+    handler.close()
+    assert capsys.readouterr().out == 'test:\n[1,2]|', (
+        'Chunks of a collection should be written within its format'
+    )
+
+
+@mark.unit
+def test_sqlite_batches(monkeypatch, tmp_path):
+    project_config = model.ProjectConfig(
+        objects={
+            'test': {
+                'type': 'object',
+                'output': {
+                    'format': 'sqlite',
+                    'directory': str(tmp_path),
+                    'sqlite_batch_size': 2,
+                },
+            }
+        }
+    )
+    monkeypatch.setattr(writers, 'CONFIG', project_config)
+    handler = writers.SQLiteHandler('test')
+    handler.load()
+    for idx in range(3):
+        handler.write({'count': idx, 'tags': ['a'], 'name': None})
+    connection = sqlite3.connect(tmp_path.joinpath(writers.DEFAULT_SQLITE_DATABASE))
+    assert connection.execute('select count(*) from test').fetchone() == (2,), (
+        'Rows should be committed once a batch is full'
+    )
+    handler.close()
+    assert connection.execute('select * from test').fetchall() == [
+        (idx, '["a"]', None) for idx in range(3)
+    ], 'Remaining rows should be committed when closing'
+
+
+@mark.unit
+def test_sqlite_database_required(monkeypatch):
+    project_config = model.ProjectConfig(
+        objects={'test': {'type': 'integer', 'output': {'format': 'sqlite'}}}
+    )
+    monkeypatch.setattr(writers, 'CONFIG', project_config)
+    with raises(ValueError, match='sqlite_database'):
+        writers.SQLiteHandler('test').load()
+
+
+@mark.unit
+def test_column_types(monkeypatch):
+    generators.load_generators()
+    project_config = model.ProjectConfig(
+        objects={
+            'test': {
+                'type': 'object',
+                'properties': {
+                    'count': {'type': 'integer'},
+                    'name': {'type': 'string'},
+                    'pick': {'type': 'choice', 'items': [1, 'a']},
+                },
+            },
+            'level': {'type': 'float'},
+        }
+    )
+    monkeypatch.setattr(writers, 'CONFIG', project_config)
+    assert writers.column_types('test') == {
+        'count': int,
+        'name': str,
+        'pick': object,
+    }, 'Choices of mixed types should be stored as text'
+    assert writers.column_types('level') == {'value': float}
+
+
+@mark.unit
+def test_parquet_row_groups(monkeypatch, tmp_path):
+    parquet = importorskip('pyarrow.parquet')
+    generators.load_generators()
+    project_config = model.ProjectConfig(
+        objects={
+            'test': {
+                'type': 'object',
+                'properties': {'count': {'type': 'integer'}},
+                'output': {
+                    'format': 'parquet',
+                    'directory': str(tmp_path),
+                    'row_group_size': 2,
+                },
+            }
+        }
+    )
+    monkeypatch.setattr(writers, 'CONFIG', project_config)
+    handler = writers.ColumnarHandler('test')
+    handler.load()
+    for idx in range(5):
+        handler.write({'count': idx})
+    handler.close()
+    parquet_file = parquet.ParquetFile(tmp_path.joinpath('test_1.parquet'))
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.read().to_pydict() == {'count': list(range(5))}
+
+
+@mark.unit
+def test_parquet_mixed_types(tmp_path):
+    parquet = importorskip('pyarrow.parquet')
+    from syntrend.cli import generate
+
+    project_file = tmp_path.joinpath('project.yaml')
+    project_file.write_text(
+        'objects:\n'
+        '  test:\n'
+        '    type: object\n'
+        '    output:\n'
+        f'      directory: {tmp_path}\n'
+        '      format: parquet\n'
+        '      count: 20\n'
+        '      row_group_size: 3\n'
+        '    properties:\n'
+        "      pick: {type: choice, items: [1, 'a']}\n"
+    )
+    result = CliRunner(mix_stderr=False).invoke(generate, [str(project_file)])
+    assert result.exit_code == 0, result.stderr
+    table = parquet.read_table(tmp_path.joinpath('test_1.parquet'))
+    assert str(table.schema.field('pick').type) == 'string'
+    assert set(table.column('pick').to_pylist()) <= {'1', 'a'}